@@ -445,6 +445,7 @@ class CodeProcessor:
                             'file_extension': metadata.get('file_extension', ''),
                             'original_name': os.path.basename(file_path),
                             'model': embedding_result.get('model', 'CodeBERT'),
+                            'user_id': (custom_metadata or {}).get('user_id', ''),
                         }
                         
                         pinecone_result = self.pinecone_storage.upsert_embedding(
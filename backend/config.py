@@ -53,6 +53,9 @@ class Config:
     # CLIP Model
     CLIP_MODEL = os.getenv("CLIP_MODEL", "ViT-B/32")
     
+    # Text query embedding cache (entries; 0 disables)
+    TEXT_EMBEDDING_CACHE_SIZE = int(os.getenv("TEXT_EMBEDDING_CACHE_SIZE", 4096))
+    
     # Compression Settings
     IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 85))
     VIDEO_CRF = int(os.getenv("VIDEO_CRF", 23))
@@ -68,6 +71,11 @@ class Config:
         cls.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
         cls.COMPRESSED_DIR.mkdir(parents=True, exist_ok=True)
     
+    @classmethod
+    def as_dict(cls):
+        """Snapshot of every setting (upper-case class attribute) as a plain dict"""
+        return {key: value for key, value in vars(cls).items() if key.isupper()}
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
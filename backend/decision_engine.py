@@ -48,6 +48,26 @@ class DecisionEngine:
         '.ipynb',
     }
     
+    PIPELINE_DESCRIPTIONS = {
+        'media': 'Media Pipeline (Images/Videos/Audio)',
+        'document': 'Document Pipeline (PDF/TXT/DOCX)',
+        'structured_data': 'Structured Data Pipeline (JSON/CSV/XML)',
+        'code': 'Code Pipeline (Source Code)',
+        'generic': 'Generic Pipeline (Unknown/Other)',
+    }
+    
+    # Extension -> pipeline lookup, built once. Groups are listed lowest
+    # precedence first so later ones overwrite earlier ones, matching the
+    # original if/elif chain (media, document, structured data, code)
+    EXTENSION_PIPELINES = {
+        ext: pipeline
+        for pipeline, extensions in (('code', CODE_EXTENSIONS),
+                                     ('structured_data', STRUCTURED_DATA_EXTENSIONS),
+                                     ('document', DOCUMENT_EXTENSIONS),
+                                     ('media', MEDIA_EXTENSIONS))
+        for ext in extensions
+    }
+    
     def __init__(self):
         """Initialize decision engine with all processors"""
         print("Initializing Decision Engine...")
@@ -120,20 +140,8 @@ class DecisionEngine:
         # else:
         #     handle_generic_pipeline()
         
-        if file_ext in self.MEDIA_EXTENSIONS:
-            return 'media', 'Media Pipeline (Images/Videos/Audio)'
-        
-        elif file_ext in self.DOCUMENT_EXTENSIONS:
-            return 'document', 'Document Pipeline (PDF/TXT/DOCX)'
-        
-        elif file_ext in self.STRUCTURED_DATA_EXTENSIONS:
-            return 'structured_data', 'Structured Data Pipeline (JSON/CSV/XML)'
-        
-        elif file_ext in self.CODE_EXTENSIONS:
-            return 'code', 'Code Pipeline (Source Code)'
-        
-        else:
-            return 'generic', 'Generic Pipeline (Unknown/Other)'
+        pipeline = self.EXTENSION_PIPELINES.get(file_ext, 'generic')
+        return pipeline, self.PIPELINE_DESCRIPTIONS[pipeline]
     
     def route_and_process(self, file_path: str,
                          compress: bool = True,
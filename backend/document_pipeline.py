@@ -419,6 +419,7 @@ class DocumentProcessor:
                             'file_extension': metadata.get('file_extension', ''),
                             'original_name': os.path.basename(file_path),
                                 'model': 'SentenceTransformer',
+                            'user_id': (custom_metadata or {}).get('user_id', ''),
                         }
                         
                         self.pinecone_storage.upsert_embedding(
@@ -0,0 +1,78 @@
+"""
+In-memory LRU cache for text query embeddings
+Repeated search queries skip the model forward pass entirely
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Hashable
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache mapping (text, model flag) to an embedding"""
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Maximum number of cached embeddings (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, Hashable], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, use_clip: bool) -> Tuple[str, bool]:
+        """
+        Build the cache key for a text query
+
+        CLIP's tokenizer lowercases and collapses whitespace itself, so those
+        variants map to the same key; other models see the text verbatim.
+        """
+        if use_clip:
+            text = " ".join(text.split()).lower()
+        return text, use_clip
+
+    def get(self, text: str, use_clip: bool) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding
+
+        Returns:
+            A copy of the cached embedding, or None on a miss
+        """
+        if self.maxsize <= 0:
+            return None
+
+        key = self.make_key(text, use_clip)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return embedding.copy()
+
+    def put(self, text: str, use_clip: bool, embedding: Optional[np.ndarray]):
+        """Store an embedding, evicting the least recently used entry when full"""
+        if self.maxsize <= 0 or embedding is None:
+            return
+
+        key = self.make_key(text, use_clip)
+        with self._lock:
+            self._entries[key] = np.array(embedding, copy=True)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached embedding and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
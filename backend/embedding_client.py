@@ -0,0 +1,60 @@
+"""
+Client for the local embedding server (embedding_server.py)
+Falls back to loading the embedding service in-process when no server is running
+"""
+import os
+from typing import Optional, List
+
+import numpy as np
+import requests
+
+
+EMBEDDING_SERVER_URL = os.getenv("EMBEDDING_SERVER_URL", "http://127.0.0.1:7070")
+EMBED_URL = f"{EMBEDDING_SERVER_URL}/embed"
+
+# Shared session so repeated calls reuse one keep-alive connection
+SESSION = requests.Session()
+
+
+def embed_texts(texts: List[str], use_clip: bool = True, normalize: bool = False) -> List[Optional[np.ndarray]]:
+    """
+    Embed texts via the embedding server, or locally if it is not running
+
+    Args:
+        texts: Texts to encode
+        use_clip: If True, use CLIP (for multimodal search). If False, use SentenceTransformer.
+        normalize: Pad/truncate each embedding to TARGET_EMBEDDING_DIM
+
+    Returns:
+        Embeddings aligned with texts (None where a text could not be embedded)
+    """
+    try:
+        response = SESSION.post(
+            EMBED_URL,
+            json={'texts': list(texts), 'use_clip': use_clip, 'normalize': normalize},
+            timeout=60
+        )
+        response.raise_for_status()
+        return [
+            np.array(embedding, dtype=np.float32) if embedding is not None else None
+            for embedding in response.json()['embeddings']
+        ]
+    except (requests.RequestException, ValueError, KeyError) as e:
+        # Server down, timing out, erroring or returning a malformed body
+        print(f"   ⚠ Embedding server unavailable at {EMBEDDING_SERVER_URL} ({e}), loading models locally")
+
+    # No usable server: pay the model load in this process
+    from embedding_service import get_embedding_service, normalize_embedding_dimension, TARGET_EMBEDDING_DIM
+
+    embeddings = get_embedding_service().generate_text_embeddings(list(texts), use_clip=use_clip)
+    if normalize:
+        embeddings = [
+            normalize_embedding_dimension(embedding, TARGET_EMBEDDING_DIM) if embedding is not None else None
+            for embedding in embeddings
+        ]
+    return embeddings
+
+
+def embed_text(text: str, use_clip: bool = True, normalize: bool = False) -> Optional[np.ndarray]:
+    """Embed a single text; see embed_texts"""
+    return embed_texts([text], use_clip=use_clip, normalize=normalize)[0]
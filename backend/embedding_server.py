@@ -0,0 +1,171 @@
+"""
+Local embedding server
+Keeps the embedding models loaded in one long-running process so scripts can
+get text embeddings over HTTP instead of loading CLIP/Gemini themselves.
+
+Run once per dev machine:
+    python embedding_server.py
+
+Requests that arrive within a few milliseconds of each other are grouped and
+embedded in a single batched model call.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+import uvicorn
+
+from embedding_service import get_embedding_service, normalize_embedding_dimension, TARGET_EMBEDDING_DIM
+
+
+EMBEDDING_SERVER_HOST = os.getenv("EMBEDDING_SERVER_HOST", "127.0.0.1")
+EMBEDDING_SERVER_PORT = int(os.getenv("EMBEDDING_SERVER_PORT", 7070))
+
+# Dynamic batching: wait this long for more requests, up to this many texts
+BATCH_WINDOW_SECONDS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", 5)) / 1000
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 64))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the models before accepting requests"""
+    await asyncio.to_thread(get_embedding_service)
+    print(f"✓ Embedding server ready (batch window {BATCH_WINDOW_SECONDS * 1000:.0f} ms, max batch {MAX_BATCH_SIZE})")
+    yield
+
+
+app = FastAPI(
+    title="Embedding Server",
+    description="Keeps embedding models warm and batches text embedding requests",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+
+class EmbedRequest(BaseModel):
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
+    use_clip: bool = True
+    normalize: bool = False  # Pad/truncate to TARGET_EMBEDDING_DIM
+
+
+# ============================================================================
+# DYNAMIC BATCHER
+# ============================================================================
+
+class TextEmbeddingBatcher:
+    """
+    Collects text embedding requests for a short window and runs each
+    (use_clip) group as one generate_text_embeddings call in a worker thread
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW_SECONDS, max_batch_size: int = MAX_BATCH_SIZE):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[bool, List[Tuple[str, asyncio.Future]]] = {}
+        self._flush_tasks: Dict[bool, asyncio.Task] = {}
+        self._running = set()  # Keeps full-batch tasks referenced until done
+
+    async def embed(self, text: str, use_clip: bool) -> Optional[np.ndarray]:
+        """Queue one text and wait for its embedding"""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(use_clip, [])
+        pending.append((text, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._start_flush(use_clip)
+        elif use_clip not in self._flush_tasks:
+            self._flush_tasks[use_clip] = asyncio.create_task(self._flush_after_window(use_clip))
+
+        return await future
+
+    async def _flush_after_window(self, use_clip: bool):
+        await asyncio.sleep(self.window)
+        self._flush_tasks.pop(use_clip, None)
+        await self._run_batch(self._pending.pop(use_clip, []), use_clip)
+
+    def _start_flush(self, use_clip: bool):
+        """Take the pending group now (it is full) and embed it in the background"""
+        task = self._flush_tasks.pop(use_clip, None)
+        if task:
+            task.cancel()
+        batch = self._pending.pop(use_clip, [])
+        task = asyncio.create_task(self._run_batch(batch, use_clip))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]], use_clip: bool):
+        if not batch:
+            return
+
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await asyncio.to_thread(
+                get_embedding_service().generate_text_embeddings, texts, use_clip
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
+batcher = TextEmbeddingBatcher()
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+@app.get("/health")
+async def health():
+    """Health check"""
+    return {"status": "healthy"}
+
+
+@app.post("/embed")
+async def embed(request: EmbedRequest):
+    """
+    Embed one text (``text``) or several (``texts``)
+
+    Returns ``embedding`` for a single text, ``embeddings`` for a list;
+    entries are null when a text could not be embedded.
+    """
+    if request.text is None and request.texts is None:
+        raise HTTPException(status_code=400, detail="Provide 'text' or 'texts'")
+
+    texts = [request.text] if request.text is not None else request.texts
+    embeddings = await asyncio.gather(*(batcher.embed(text, request.use_clip) for text in texts))
+
+    results = []
+    for embedding in embeddings:
+        if embedding is None:
+            results.append(None)
+            continue
+        if request.normalize:
+            embedding = normalize_embedding_dimension(embedding, TARGET_EMBEDDING_DIM)
+        results.append(np.asarray(embedding, dtype=np.float32).tolist())
+
+    if request.text is not None:
+        return {"embedding": results[0]}
+    return {"embeddings": results}
+
+
+if __name__ == "__main__":
+    print("Starting Embedding Server...")
+    print(f"Embeddings available at: http://{EMBEDDING_SERVER_HOST}:{EMBEDDING_SERVER_PORT}/embed")
+
+    uvicorn.run(
+        app,
+        host=EMBEDDING_SERVER_HOST,
+        port=EMBEDDING_SERVER_PORT,
+        log_level="info"
+    )
@@ -7,7 +7,7 @@ import json
 import csv
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
 import numpy as np
 
 # Image/Video embeddings
@@ -49,13 +49,10 @@ except ImportError:
     FFMPEG_AVAILABLE = False
 
 from config import Config
+from embedding_cache import EmbeddingCache
 
-# Gemini API (text embeddings)
-try:
-    from google import genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+# Gemini API (text embeddings) - pooled client lives in gemini_client
+from gemini_client import GEMINI_AVAILABLE, get_gemini_client
 
 # Vertex AI (multimodal embeddings)
 try:
@@ -84,6 +81,8 @@ def normalize_embedding_dimension(embedding: np.ndarray, target_dim: int = TARGE
     Returns:
         Normalized embedding of target_dim
     """
+    # Contiguous float32 keeps downstream dot products on the BLAS fast path
+    embedding = np.ascontiguousarray(embedding, dtype=np.float32).ravel()
     current_dim = len(embedding)
     
     if current_dim == target_dim:
@@ -91,8 +90,9 @@ def normalize_embedding_dimension(embedding: np.ndarray, target_dim: int = TARGE
     
     elif current_dim < target_dim:
         # Pad with zeros
-        padding = np.zeros(target_dim - current_dim)
-        return np.concatenate([embedding, padding])
+        padded = np.zeros(target_dim, dtype=np.float32)
+        padded[:current_dim] = embedding
+        return padded
     
     else:
         # Truncate to target dimension (simple approach)
@@ -123,11 +123,14 @@ class UnifiedEmbeddingService:
         self._whisper_model = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
+        # Exact-match cache for text query embeddings
+        self._text_embedding_cache = EmbeddingCache(maxsize=Config.TEXT_EMBEDDING_CACHE_SIZE)
+        
         # Initialize Gemini client (for text embeddings)
         self._gemini_client = None
         if GEMINI_AVAILABLE and Config.GEMINI_API_KEY:
             try:
-                self._gemini_client = genai.Client(api_key=Config.GEMINI_API_KEY)
+                self._gemini_client = get_gemini_client()
             except Exception as e:
                 print(f"   ⚠ Gemini client initialization failed: {e}")
         
@@ -236,6 +239,26 @@ class UnifiedEmbeddingService:
             print(f"   ⚠ Gemini text embedding failed: {e}")
             return None
     
+    def generate_gemini_text_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Generate Gemini embeddings for several texts in a single API call"""
+        if not self._gemini_client or not texts:
+            return [None] * len(texts)
+        
+        try:
+            result = self._gemini_client.models.embed_content(
+                model="models/embedding-001",
+                contents=list(texts)
+            )
+            
+            # One ContentEmbedding per input, in input order
+            if hasattr(result, 'embeddings') and result.embeddings and len(result.embeddings) == len(texts):
+                return [np.array(e.values, dtype=np.float32) for e in result.embeddings]
+            return [None] * len(texts)
+            
+        except Exception as e:
+            print(f"   ⚠ Gemini batch text embedding failed: {e}")
+            return [None] * len(texts)
+    
     def generate_gemini_image_embedding(self, image_path: str) -> Optional[np.ndarray]:
         """
         DEPRECATED: Gemini embedding-001 only supports text, not images.
@@ -543,17 +566,24 @@ class UnifiedEmbeddingService:
         if not text or len(text.strip()) == 0:
             return None
         
+        # Repeated search queries (CLIP path) skip the model entirely; document
+        # chunks and transcripts (use_clip=False) are not cached so ingestion
+        # does not evict them
+        if use_clip:
+            cached = self._text_embedding_cache.get(text, use_clip)
+            if cached is not None:
+                return cached
+        
         try:
             if use_clip:
                 # 🔄 TOGGLE: Comment/uncomment one of these two lines to switch
                 # NOTE: If using Gemini, must set TARGET_EMBEDDING_DIM to 768 and recreate Pinecone index
-                # return self.generate_gemini_text_embedding(text)  # 🌟 Gemini (768 dim, multimodal)
-                return self._generate_clip_text_embedding(text)  # 🏠 Local CLIP (512 dim, works with current index)
+                # embedding = self.generate_gemini_text_embedding(text)  # 🌟 Gemini (768 dim, multimodal)
+                embedding = self._generate_clip_text_embedding(text)  # 🏠 Local CLIP (512 dim, works with current index)
             
             elif SENTENCE_TRANSFORMERS_AVAILABLE:
                 # Fallback to SentenceTransformer (for documents/code)
                 embedding = self.text_model.encode(text, convert_to_numpy=True)
-                return embedding
             
             else:
                 return None
@@ -561,6 +591,69 @@ class UnifiedEmbeddingService:
         except Exception as e:
             print(f"   ⚠ Text embedding failed: {e}")
             return None
+        
+        if use_clip:
+            self._text_embedding_cache.put(text, use_clip, embedding)
+        return embedding
+    
+    def generate_text_embeddings(self, texts: List[str], use_clip: bool = True) -> List[Optional[np.ndarray]]:
+        """
+        Generate text embeddings for several texts in one model call
+        
+        Args:
+            texts: Texts to encode
+            use_clip: If True, use CLIP (for multimodal search). If False, use SentenceTransformer.
+        
+        Returns:
+            Embeddings aligned with texts (None for empty texts or on failure)
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        indices = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            if use_clip:  # Only search queries are cached (see generate_text_embedding)
+                results[i] = self._text_embedding_cache.get(text, use_clip)
+            if results[i] is None:
+                indices.append(i)
+        if not indices:
+            return results
+        
+        batch = [texts[i] for i in indices]
+        
+        try:
+            if use_clip:
+                # Same toggle as generate_text_embedding
+                # embeddings = self.generate_gemini_text_embeddings(batch)  # 🌟 Gemini (768 dim, multimodal)
+                embeddings = self._generate_clip_text_embeddings(batch)  # 🏠 Local CLIP (512 dim, works with current index)
+            elif SENTENCE_TRANSFORMERS_AVAILABLE:
+                embeddings = list(self.text_model.encode(batch, convert_to_numpy=True, batch_size=64))
+            else:
+                return results
+            
+            for i, embedding in zip(indices, embeddings):
+                results[i] = embedding
+                if use_clip:
+                    self._text_embedding_cache.put(texts[i], use_clip, embedding)
+        except Exception as e:
+            print(f"   ⚠ Batch text embedding failed: {e}")
+        
+        return results
+    
+    def _generate_clip_text_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Generate CLIP text embeddings for a batch of texts (local)"""
+        if not CLIP_AVAILABLE:
+            return [None] * len(texts)
+        
+        try:
+            text_tokens = clip.tokenize(texts, truncate=True).to(self.device)
+            with torch.no_grad():
+                text_features = self.clip_model.encode_text(text_tokens)
+                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+            return list(text_features.cpu().numpy())
+        except Exception as e:
+            print(f"   ⚠ CLIP batch text embedding failed: {e}")
+            return [None] * len(texts)
     
     def _generate_clip_text_embedding(self, text: str) -> Optional[np.ndarray]:
         """Generate CLIP text embedding (local)"""
@@ -568,7 +661,8 @@ class UnifiedEmbeddingService:
             return None
         
         try:
-            text_tokens = clip.tokenize([text]).to(self.device)
+            # Truncate like the batch path so long queries embed identically either way
+            text_tokens = clip.tokenize([text], truncate=True).to(self.device)
             with torch.no_grad():
                 text_features = self.clip_model.encode_text(text_tokens)
                 text_features = text_features / text_features.norm(dim=-1, keepdim=True)
@@ -619,17 +713,7 @@ class UnifiedEmbeddingService:
             return None
         
         try:
-            # Convert to text
-            if file_type == 'json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                text = self.convert_json_to_text(data)
-            elif file_type == 'csv':
-                text = self.convert_csv_to_text(file_path)
-            elif file_type == 'xml':
-                text = self.convert_xml_to_text(file_path)
-            else:
-                return None
+            text = self._structured_data_text(file_path, file_type)
             
             if not text:
                 return None
@@ -644,10 +728,64 @@ class UnifiedEmbeddingService:
             print(f"   ⚠ Structured data embedding failed: {e}")
             return None
     
+    def _structured_data_text(self, file_path: str, file_type: str) -> Optional[str]:
+        """Convert a structured data file ('json', 'csv', 'xml') to embeddable text"""
+        if file_type == 'json':
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return self.convert_json_to_text(data)
+        elif file_type == 'csv':
+            return self.convert_csv_to_text(file_path)
+        elif file_type == 'xml':
+            return self.convert_xml_to_text(file_path)
+        return None
+    
     # ========================================================================
     # UNIFIED INTERFACE
     # ========================================================================
     
+    @staticmethod
+    def _detect_file_type(file_ext: str) -> str:
+        """Map a file extension to the embedding file type"""
+        if file_ext in ['.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif']:
+            return 'image'
+        elif file_ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm']:
+            return 'video'
+        elif file_ext in ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac']:
+            return 'audio'
+        elif file_ext in ['.pdf', '.txt', '.docx', '.doc']:
+            return 'document'
+        elif file_ext in ['.py', '.java', '.js', '.ts', '.cpp', '.c', '.go', '.rs']:
+            return 'code'
+        elif file_ext in ['.json', '.csv', '.xml']:
+            return 'structured'
+        return 'unknown'
+    
+    @staticmethod
+    def _embedding_result(embedding: Optional[np.ndarray], model_name: str,
+                          metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Normalize an embedding and wrap it in the generate_embedding result format"""
+        if embedding is None:
+            print(f"   ⚠ Could not generate embedding")
+            return None
+        
+        # Normalize to target dimension for Pinecone compatibility
+        original_dim = len(embedding)
+        embedding = normalize_embedding_dimension(embedding, TARGET_EMBEDDING_DIM)
+        
+        if original_dim != TARGET_EMBEDDING_DIM:
+            print(f"   ✓ Generated: {original_dim} dimensions → normalized to {TARGET_EMBEDDING_DIM} ({model_name})")
+        else:
+            print(f"   ✓ Generated: {len(embedding)} dimensions ({model_name})")
+        
+        return {
+            'embedding': embedding,
+            'dimension': len(embedding),
+            'original_dimension': original_dim,
+            'model': model_name,
+            'metadata': metadata
+        }
+    
     def generate_embedding(self, file_path: str, file_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Generate embedding for ANY file type
@@ -669,20 +807,7 @@ class UnifiedEmbeddingService:
         
         # Auto-detect file type if not provided
         if not file_type:
-            if file_ext in ['.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif']:
-                file_type = 'image'
-            elif file_ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm']:
-                file_type = 'video'
-            elif file_ext in ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac']:
-                file_type = 'audio'
-            elif file_ext in ['.pdf', '.txt', '.docx', '.doc']:
-                file_type = 'document'
-            elif file_ext in ['.py', '.java', '.js', '.ts', '.cpp', '.c', '.go', '.rs']:
-                file_type = 'code'
-            elif file_ext in ['.json', '.csv', '.xml']:
-                file_type = 'structured'
-            else:
-                file_type = 'unknown'
+            file_type = self._detect_file_type(file_ext)
         
         print(f"🔍 Generating {file_type} embedding for: {Path(file_path).name}")
         
@@ -739,26 +864,66 @@ class UnifiedEmbeddingService:
             # Model name depends on what's available
             model_name = 'Gemini Text' if self._gemini_client else 'SentenceTransformer'
         
-        if embedding is None:
-            print(f"   ⚠ Could not generate embedding")
-            return None
+        return self._embedding_result(embedding, model_name, metadata)
+    
+    def generate_embeddings_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Generate embeddings for several files, batching the text-based ones
         
-        # Normalize to target dimension for Pinecone compatibility
-        original_dim = len(embedding)
-        embedding = normalize_embedding_dimension(embedding, TARGET_EMBEDDING_DIM)
+        Document and structured files are converted to text and embedded
+        together in one Gemini request (or one SentenceTransformer batch);
+        every other type goes through generate_embedding one file at a time.
         
-        if original_dim != TARGET_EMBEDDING_DIM:
-            print(f"   ✓ Generated: {original_dim} dimensions → normalized to {TARGET_EMBEDDING_DIM} ({model_name})")
-        else:
-            print(f"   ✓ Generated: {len(embedding)} dimensions ({model_name})")
+        Args:
+            items: List of (file_path, file_type) tuples; file_type may be None
+            
+        Returns:
+            Results aligned with items, each in the generate_embedding format
+            (None where no embedding could be generated)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        texts = []
+        text_items = []  # (index, file_type) per entry in texts
         
-        return {
-            'embedding': embedding,
-            'dimension': len(embedding),
-            'original_dimension': original_dim,
-            'model': model_name,
-            'metadata': metadata
-        }
+        for i, (file_path, file_type) in enumerate(items):
+            file_ext = Path(file_path).suffix.lower()
+            file_type = file_type or self._detect_file_type(file_ext)
+            
+            if file_type not in ('document', 'structured'):
+                results[i] = self.generate_embedding(file_path, file_type)
+                continue
+            
+            print(f"🔍 Preparing {file_type} text for: {Path(file_path).name}")
+            text = None
+            try:
+                if file_type == 'document':
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        text = f.read()[:5000]  # First 5000 chars
+                elif SENTENCE_TRANSFORMERS_AVAILABLE:
+                    struct_type = 'json' if file_ext == '.json' else 'csv' if file_ext == '.csv' else 'xml'
+                    text = self._structured_data_text(file_path, struct_type)
+            except Exception as e:
+                print(f"   ⚠ Text extraction failed: {e}")
+            
+            if text:
+                texts.append(text)
+                text_items.append((i, file_type))
+            else:
+                print(f"   ⚠ Could not generate embedding")
+        
+        if texts:
+            print(f"🔍 Embedding {len(texts)} texts in one batch")
+            if self._gemini_client:
+                embeddings = self.generate_gemini_text_embeddings(texts)
+                model_name = 'Gemini Text'
+            else:
+                embeddings = self.generate_text_embeddings(texts, use_clip=False)
+                model_name = 'SentenceTransformer'
+            
+            for (i, file_type), embedding in zip(text_items, embeddings):
+                results[i] = self._embedding_result(embedding, model_name, {'file_type': file_type})
+        
+        return results
 
 
 # Global instance (singleton pattern)
@@ -0,0 +1,32 @@
+"""
+Shared Gemini API client
+Kept separate from embedding_service so scripts that only talk to Gemini
+do not pay for importing torch/CLIP/Whisper
+"""
+from config import Config
+
+try:
+    import httpx
+    from google import genai
+    from google.genai import types as genai_types
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+
+# Global Gemini client (singleton) - one pooled keep-alive transport for every request
+_gemini_client = None
+
+def get_gemini_client():
+    """Get global Gemini client, or None if Gemini is unavailable"""
+    global _gemini_client
+    if _gemini_client is None and GEMINI_AVAILABLE and Config.GEMINI_API_KEY:
+        transport = httpx.HTTPTransport(
+            retries=3,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+        )
+        _gemini_client = genai.Client(
+            api_key=Config.GEMINI_API_KEY,
+            http_options=genai_types.HttpOptions(client_args={'transport': transport}),
+        )
+    return _gemini_client
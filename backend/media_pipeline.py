@@ -729,7 +729,7 @@ class EmbeddingsGenerator:
             Numpy array of embeddings (normalized)
         """
         try:
-            text_input = clip.tokenize([text]).to(self.device)
+            text_input = clip.tokenize([text], truncate=True).to(self.device)
             
             with torch.no_grad():
                 text_features = self.model.encode_text(text_input)
@@ -740,6 +740,29 @@ class EmbeddingsGenerator:
         except Exception as e:
             raise Exception(f"Error generating text embedding: {str(e)}")
     
+    def generate_text_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several texts in one forward pass
+        
+        Args:
+            texts: Texts to encode
+            
+        Returns:
+            Numpy array of shape (len(texts), dim), one normalized row per text
+        """
+        try:
+            # Truncate over-long queries (77 tokens) so one can't fail the whole batch
+            text_input = clip.tokenize(list(texts), truncate=True).to(self.device)
+            
+            with torch.no_grad():
+                text_features = self.model.encode_text(text_input)
+                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+            
+            return text_features.cpu().numpy()
+            
+        except Exception as e:
+            raise Exception(f"Error generating text embeddings: {str(e)}")
+    
     def generate_embedding(self, file_path: str, media_type: Optional[str] = None,
                           **kwargs) -> np.ndarray:
         """
@@ -805,16 +828,23 @@ class EmbeddingsGenerator:
         Returns:
             List of (index, similarity_score) tuples
         """
-        similarities = []
+        if len(embeddings_list) == 0 or top_k <= 0:
+            return []
         
-        for idx, embedding in enumerate(embeddings_list):
-            similarity = self.compute_similarity(query_embedding, embedding)
-            similarities.append((idx, similarity))
+        # Score every candidate with one BLAS matrix-vector product
+        # (embeddings should already be normalized, as in compute_similarity)
+        candidates = np.ascontiguousarray(np.asarray(embeddings_list), dtype=np.float32)
+        query = np.ascontiguousarray(query_embedding, dtype=np.float32).ravel()
+        scores = candidates @ query
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        # Select the top_k without sorting the whole array
+        if top_k < len(scores):
+            top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_indices = np.arange(len(scores))
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind='stable')]
         
-        return similarities[:top_k]
+        return [(int(idx), float(scores[idx])) for idx in top_indices]
 
 
 # ============================================================================
@@ -996,6 +1026,7 @@ class MediaProcessor:
                                 'format': metadata.get('format', ''),
                                 'original_name': os.path.basename(file_path),
                                 'model': embedding_result.get('model', 'unknown'),
+                                'user_id': (custom_metadata or {}).get('user_id', ''),
                             }
                             
                             pinecone_result = self.pinecone_storage.upsert_embedding(
@@ -1128,6 +1159,83 @@ class MediaProcessor:
                 'error': f"Search failed: {str(e)}"
             }
     
+    def search_similar_media_batch(self, query_type: str, queries: List[str],
+                                   top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search for similar media for several text queries at once
+        
+        All queries are embedded in a single CLIP pass and sent to Pinecone
+        together; database records shared between queries are fetched once.
+        
+        Args:
+            query_type: Type of query (only 'text' is supported)
+            queries: Text queries
+            top_k: Number of results to return per query
+            
+        Returns:
+            List of search results aligned with ``queries``, each in the
+            same format as ``search_similar_media``
+        """
+        if query_type != 'text':
+            error = {
+                'success': False,
+                'error': f"Unsupported query type for batch search: {query_type}"
+            }
+            return [dict(error) for _ in queries]
+        
+        if not queries:
+            return []
+        
+        try:
+            print(f"\nSearching for similar media ({len(queries)} queries, top_k: {top_k})")
+            
+            # Generate all query embeddings in one forward pass
+            query_embeddings = self.embeddings_generator.generate_text_embeddings(queries)
+            
+            # Search in Pinecone
+            matches_per_query = self.pinecone_storage.query_batch(
+                query_vectors=query_embeddings,
+                top_k=top_k
+            )
+            
+            # Enrich with full metadata from database, once per file
+            db_records = {}
+            batch_results = []
+            for matches in matches_per_query:
+                results = []
+                for item in matches:
+                    file_id = item['file_id']
+                    
+                    if file_id not in db_records:
+                        db_records[file_id] = self.db_storage.get_media(file_id)
+                    db_record = db_records[file_id]
+                    
+                    if db_record:
+                        results.append({
+                            'file_id': file_id,
+                            'similarity_score': item['score'],
+                            'metadata': db_record.get('metadata', {}),
+                            's3_info': db_record.get('s3_info', {}),
+                        })
+                
+                batch_results.append({
+                    'success': True,
+                    'query_type': query_type,
+                    'results': results,
+                    'count': len(results),
+                })
+            
+            print(f"✓ Completed {len(batch_results)} searches")
+            
+            return batch_results
+            
+        except Exception as e:
+            error = {
+                'success': False,
+                'error': f"Search failed: {str(e)}"
+            }
+            return [dict(error) for _ in queries]
+    
     def get_media_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """
         Get complete information about a media file
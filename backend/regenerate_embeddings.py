@@ -107,6 +107,7 @@ def main():
                 'format': img.get('metadata', {}).get('format', ''),
                 'original_name': file_name,
                 'model': embedding_result.get('model', 'CLIP'),
+                'user_id': user_id,
             }
             
             pinecone_result = pinecone_storage.upsert_embedding(
@@ -117,6 +117,7 @@ def main():
                 'format': img.get('metadata', {}).get('format', ''),
                 'original_name': file_name,
                 'model': model_used,
+                'user_id': user_id,
             }
             
             pinecone_result = pinecone_storage.upsert_embedding(
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Run the backend check scripts in a single process
+
+Each check script can still be run on its own, but doing so pays the full
+import cost (torch, CLIP, boto3, Pinecone SDK) and the client handshakes every
+time. Running them from here imports everything once and shares the
+embedding service, MongoDB and Pinecone singletons across all checks.
+Text-only checks embed through the embedding server (embedding_server.py)
+when it is running, so the models are only loaded here when needed.
+
+Usage:
+    python run_checks.py                  # run every check
+    python run_checks.py verify_search    # run selected checks
+"""
+
+import sys
+import os
+import time
+import traceback
+import importlib
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from embedding_client import EMBEDDING_SERVER_URL, SESSION
+from storage_pinecone import get_pinecone_storage
+from storage_db import get_db_storage
+
+# Modules exposing a main() entry point that returns True on success, in run order
+CHECKS = [
+    'verify_storage',
+    'test_vertex_init',
+    'test_structured_gemini',
+    'test_search_red_dress',
+    'verify_search',
+]
+
+# Checks that embed files and always use the in-process embedding service
+LOCAL_EMBEDDING_CHECKS = {'test_vertex_init', 'test_structured_gemini'}
+
+
+def embedding_server_available():
+    """True if the local embedding server answers its health check"""
+    try:
+        return SESSION.get(f"{EMBEDDING_SERVER_URL}/health", timeout=1).ok
+    except Exception:
+        return False
+
+
+def main(names=None):
+    """
+    Run the selected checks, sharing clients between them
+
+    Args:
+        names: Check module names to run (defaults to all of CHECKS)
+
+    Returns:
+        True if every check passed
+    """
+    names = names or CHECKS
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        print(f"❌ Unknown checks: {', '.join(unknown)}")
+        print(f"   Available: {', '.join(CHECKS)}")
+        return False
+
+    # Warm the shared clients once; the checks pick up the same singletons
+    print("⏳ Initializing shared services...")
+    start = time.perf_counter()
+    if LOCAL_EMBEDDING_CHECKS.intersection(names) or not embedding_server_available():
+        from embedding_service import get_embedding_service
+        get_embedding_service()
+    else:
+        print(f"   ✓ Using embedding server at {EMBEDDING_SERVER_URL}")
+    get_pinecone_storage()
+    get_db_storage()
+    print(f"   ✓ Services ready in {time.perf_counter() - start:.2f}s")
+
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            ok = bool(importlib.import_module(name).main())
+            results[name] = (ok, time.perf_counter() - start)
+        except Exception:
+            traceback.print_exc()
+            results[name] = (False, time.perf_counter() - start)
+
+    print("\n" + "=" * 80)
+    print("CHECK SUMMARY")
+    print("=" * 80)
+    for name, (ok, elapsed) in results.items():
+        print(f"   {'✅' if ok else '❌'} {name:<28} {elapsed:.2f}s")
+
+    return all(ok for ok, _ in results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(sys.argv[1:]) else 1)
@@ -57,6 +57,9 @@ class MongoDBStorage:
             # Index on file_id for quick lookups
             self.collection.create_index([('file_id', ASCENDING)], unique=True)
             
+            # Compound index for per-user file lookups (covers user_id + file_id $in)
+            self.collection.create_index([('user_id', ASCENDING), ('file_id', ASCENDING)])
+            
             # Index on media type for filtering
             self.collection.create_index([('metadata.type', ASCENDING)])
             
@@ -121,14 +124,15 @@ class MongoDBStorage:
                 }
             else:
                 # Insert new document
+                now = datetime.utcnow()
                 document = {
                     'file_id': file_id,
                     'metadata': metadata,
                     's3_info': s3_info,
                     'embedding_info': embedding_info,
                     'user_id': user_id,  # Store user_id at root level for filtering
-                    'created_at': datetime.utcnow(),
-                    'updated_at': datetime.utcnow(),
+                    'created_at': now,
+                    'updated_at': now,
                 }
                 
                 result = self.collection.insert_one(document)
@@ -299,13 +303,14 @@ class SupabaseStorage:
             Dictionary with insertion result
         """
         try:
+            now = datetime.utcnow().isoformat()
             document = {
                 'file_id': file_id,
                 'metadata': metadata,
                 's3_info': s3_info,
                 'embedding_info': embedding_info,
-                'created_at': datetime.utcnow().isoformat(),
-                'updated_at': datetime.utcnow().isoformat(),
+                'created_at': now,
+                'updated_at': now,
             }
             
             result = self.client.table(self.table_name).insert(document).execute()
@@ -4,6 +4,7 @@ Stores and searches embeddings for semantic similarity
 """
 from typing import List, Dict, Any, Optional, Tuple, Union
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from pinecone import Pinecone, ServerlessSpec
 import numpy as np
@@ -240,6 +241,50 @@ class PineconeStorage:
             print(f"Error searching similar embeddings: {e}")
             return []
     
+    def query_batch(self, query_vectors: Union[List[List[float]], np.ndarray], top_k: int = 10,
+                    filter: Optional[Dict[str, Any]] = None,
+                    max_workers: int = 8) -> List[List[Dict[str, Any]]]:
+        """
+        Query Pinecone index for several vectors at once
+        
+        The index API takes one vector per query, so the queries are issued
+        concurrently over the client's connection pool.
+        
+        Args:
+            query_vectors: Query embedding vectors (list or 2-D array)
+            top_k: Number of results to return per vector
+            filter: Metadata filters applied to every query
+            max_workers: Maximum number of concurrent queries
+            
+        Returns:
+            List of match lists aligned with ``query_vectors``; each match
+            has 'file_id', 'score' and 'metadata'
+        """
+        if isinstance(query_vectors, np.ndarray):
+            query_vectors = query_vectors.tolist()
+        
+        if not query_vectors:
+            return []
+        
+        def run_query(vector):
+            results = self.query(
+                query_vector=vector,
+                top_k=top_k,
+                filter=filter,
+                include_metadata=True
+            )
+            return [
+                {
+                    'file_id': match['id'],
+                    'score': match['score'],
+                    'metadata': match.get('metadata') or {},
+                }
+                for match in results.get('matches', [])
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(query_vectors))) as executor:
+            return list(executor.map(run_query, query_vectors))
+    
     def get_embedding(self, file_id: str) -> Optional[Dict[str, Any]]:
         """
         Get embedding by file ID
@@ -348,6 +393,22 @@ class PineconeStorage:
         return self.search_similar(text_embedding, top_k=top_k)
 
 
+# Singleton instance
+_pinecone_storage_instance = None
+
+def get_pinecone_storage():
+    """
+    Factory function to get Pinecone storage (singleton)
+    
+    Returns:
+        Pinecone storage instance
+    """
+    global _pinecone_storage_instance
+    if _pinecone_storage_instance is None:
+        _pinecone_storage_instance = PineconeStorage()
+    return _pinecone_storage_instance
+
+
 if __name__ == "__main__":
     # Test Pinecone storage
     import sys
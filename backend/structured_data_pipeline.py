@@ -12,8 +12,15 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional, Union, Tuple
 import hashlib
 import gzip
+import shutil
+import copy
+import threading
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from itertools import islice
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 try:
     import pandas as pd
@@ -27,6 +34,30 @@ try:
 except ImportError:
     SUPABASE_AVAILABLE = False
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 try:
     import psycopg2
     from psycopg2.extras import Json
@@ -39,6 +70,73 @@ from storage_s3 import S3Storage
 from storage_db import get_db_storage
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+if MSGSPEC_AVAILABLE:
+    class StructuredDataRow(msgspec.Struct):
+        """One 'structured_data' table row; data is pre-serialized JSON"""
+        file_id: str
+        user_id: str
+        row_index: int
+        data: msgspec.Raw
+        created_at: str
+
+
+# JSON arrays above this size are streamed instead of loaded into memory
+JSON_STREAMING_THRESHOLD = 50_000_000
+JSON_STREAMING_SAMPLE_SIZE = 100
+
+
+class StreamedJsonArray:
+    """
+    Large top-level JSON array parsed lazily with ijson
+    
+    Holds only a head sample for analysis; iterating re-opens the file and
+    yields one element at a time. row_count is None until validate() or a
+    full iteration completes.
+    """
+    
+    def __init__(self, file_path: str, sample_size: int = JSON_STREAMING_SAMPLE_SIZE):
+        self.file_path = file_path
+        self.row_count: Optional[int] = None
+        with open(file_path, 'rb') as f:
+            self.head = list(islice(ijson.items(f, 'item', use_float=True), sample_size))
+    
+    def __iter__(self):
+        count = 0
+        with open(self.file_path, 'rb') as f:
+            for item in ijson.items(f, 'item', use_float=True):
+                count += 1
+                yield item
+        self.row_count = count
+    
+    def validate(self) -> int:
+        """
+        Parse the whole array once, without keeping any element, so malformed
+        JSON is rejected before anything is stored
+        
+        ijson uses its C (yajl2_c) backend when available.
+        
+        Returns:
+            Number of elements in the array
+        """
+        with open(self.file_path, 'rb') as f:
+            self.row_count = sum(1 for _ in ijson.items(f, 'item', use_float=True))
+        return self.row_count
+
+
+# Inferred schemas keyed on (sha256_hash, file_type, hints) - re-uploads of an
+# identical file skip schema inference entirely
+SCHEMA_CACHE_SIZE = 1024
+_schema_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
 # ============================================================================
 # SCHEMA ANALYZER
 # ============================================================================
@@ -58,6 +156,11 @@ class SchemaAnalyzer:
         Returns:
             Comprehensive analysis including structure type, nesting, uniformity
         """
+        streamed = isinstance(data, StreamedJsonArray)
+        if streamed:
+            # Analyze the head sample; the full length is unknown until streamed
+            data = data.head
+        
         analysis = {
             'data_type': type(data).__name__,
             'is_array': isinstance(data, list),
@@ -78,6 +181,10 @@ class SchemaAnalyzer:
         elif isinstance(data, dict):
             analysis.update(SchemaAnalyzer._analyze_object(data))
         
+        if streamed:
+            analysis['is_streamed'] = True
+            analysis['array_length'] = None
+        
         # Apply metadata hints if provided
         if metadata:
             analysis['metadata_hints'] = metadata
@@ -178,7 +285,11 @@ class SchemaAnalyzer:
         
         nested_keys = [k for k, v in data.items() if isinstance(v, (dict, list))]
         
-        depth = SchemaAnalyzer._calculate_nesting_depth(data)
+        # A flat object is one level deep - only recurse when something is nested
+        if nested_keys:
+            depth = SchemaAnalyzer._calculate_nesting_depth(data)
+        else:
+            depth = 1 if data else 0
         
         return {
             'keys': keys,
@@ -192,20 +303,11 @@ class SchemaAnalyzer:
     @staticmethod
     def _calculate_nesting_depth(obj: Any, current_depth: int = 0) -> int:
         """Calculate maximum nesting depth"""
-        if not isinstance(obj, (dict, list)):
+        if not obj or not isinstance(obj, (dict, list)):
             return current_depth
         
-        if isinstance(obj, dict):
-            if not obj:
-                return current_depth
-            return max(SchemaAnalyzer._calculate_nesting_depth(v, current_depth + 1) for v in obj.values())
-        
-        if isinstance(obj, list):
-            if not obj:
-                return current_depth
-            return max(SchemaAnalyzer._calculate_nesting_depth(item, current_depth + 1) for item in obj[:10])
-        
-        return current_depth
+        children = obj.values() if isinstance(obj, dict) else obj[:10]
+        return max(SchemaAnalyzer._calculate_nesting_depth(v, current_depth + 1) for v in children)
     
     @staticmethod
     def _detect_relationships(data: List[Dict], all_keys: set) -> List[Dict[str, Any]]:
@@ -277,6 +379,36 @@ class DatabaseDecisionEngine:
         Returns:
             Tuple of (decision, reason, recommendations)
         """
+        # Only these factors influence the decision, so memoize on them
+        factors = frozenset({
+            'is_uniform': bool(analysis.get('is_uniform')),
+            'is_tabular': bool(analysis.get('is_tabular')),
+            'nesting_depth': analysis.get('nesting_depth', 0),
+            'has_relationships': bool(analysis.get('relationship_candidates')),
+            'has_arrays_in_objects': bool(analysis.get('has_arrays_in_objects')),
+            'schema_evolution_expected': bool(analysis.get('schema_evolution_expected')),
+            'prefer_sql': bool(analysis.get('prefer_sql')),
+            'prefer_nosql': bool(analysis.get('prefer_nosql')),
+            'is_large': analysis.get('is_streamed', False) or (analysis.get('array_length') or 0) > 10000,
+        }.items())
+        
+        decision, reason_summary, recommendations = DatabaseDecisionEngine._decide_cached(factors)
+        
+        # Streamed arrays are too large for a single MongoDB document; only SQL
+        # (one row per element) can store them, whatever the scores say
+        if analysis.get('is_streamed') and decision != 'sql':
+            decision = 'sql'
+            reason_summary = (f"SQL required for streamed JSON array "
+                              f"(score: {recommendations['sql_score']} vs {recommendations['nosql_score']})")
+        
+        # Callers may mutate the recommendations, so hand out a copy
+        return decision, reason_summary, copy.deepcopy(recommendations)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _decide_cached(factors: frozenset) -> Tuple[str, str, Dict[str, Any]]:
+        """Score SQL vs NoSQL from a frozenset of decision factors"""
+        analysis = dict(factors)
         score_sql = 0
         score_nosql = 0
         reasons = []
@@ -308,7 +440,7 @@ class DatabaseDecisionEngine:
             reasons.append("Deep nesting favors NoSQL")
         
         # Factor 4: Relationships
-        if analysis.get('relationship_candidates'):
+        if analysis.get('has_relationships'):
             score_sql += 2
             reasons.append("Detected relationships favor SQL")
         
@@ -331,8 +463,7 @@ class DatabaseDecisionEngine:
             reasons.append("User preference for NoSQL")
         
         # Factor 8: Data size (array length)
-        array_length = analysis.get('array_length', 0)
-        if array_length > 10000:
+        if analysis.get('is_large'):
             # Very large datasets might benefit from NoSQL scalability
             score_nosql += 1
             reasons.append("Large dataset may benefit from NoSQL scalability")
@@ -378,6 +509,11 @@ class SchemaInferrer:
             'created_at': datetime.utcnow().isoformat(),
         }
         
+        if isinstance(data, StreamedJsonArray):
+            # Infer from the head sample; the row count comes from the validation pass
+            schema['row_count'] = data.row_count
+            data = data.head
+        
         if file_type == 'json':
             schema.update(SchemaInferrer._infer_json_schema(data, analysis))
         elif file_type == 'csv':
@@ -1002,13 +1138,14 @@ class SchemaManifestManager:
         Returns:
             Save result
         """
+        now = datetime.utcnow().isoformat()
         manifest = {
             'file_id': file_id,
             'schema_version': schema.get('version', '1.0'),
             'storage_backend': storage_backend,
             'schema': schema,
             'metadata': metadata,
-            'created_at': datetime.utcnow().isoformat(),
+            'created_at': now,
             'history': [],
         }
         
@@ -1020,7 +1157,7 @@ class SchemaManifestManager:
                     {
                         '$set': {
                             'schema_manifest': manifest,
-                            'updated_at': datetime.utcnow().isoformat(),
+                            'updated_at': now,
                         }
                     },
                     upsert=True
@@ -1065,6 +1202,11 @@ class StructuredDataProcessor:
     schema inference, and automatic table/collection creation
     """
     
+    # Supabase client is process-wide so new processors skip the auth handshake
+    _supabase_client = None
+    _rest_client = None
+    _supabase_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize structured data processor"""
         print("Initializing Enhanced Structured Data Processor...")
@@ -1081,26 +1223,78 @@ class StructuredDataProcessor:
         self.nosql_generator = NoSqlSchemaGenerator()
         self.manifest_manager = SchemaManifestManager(self.db_storage)
         
-        # Initialize Supabase client (for SQL storage)
-        self._supabase_client = None
-        
         print("Enhanced Structured Data Processor initialized!")
     
     def get_supabase_client(self) -> Optional[Client]:
-        """Get Supabase client for SQL storage"""
-        if self._supabase_client is None and SUPABASE_AVAILABLE:
-            supabase_url = os.getenv("SUPABASE_URL")
-            # Use service role key for admin operations (creating tables, etc.)
-            supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+        """Get Supabase client for SQL storage (shared across all processors)"""
+        cls = StructuredDataProcessor
+        if cls._supabase_client is None and SUPABASE_AVAILABLE:
+            with cls._supabase_lock:
+                if cls._supabase_client is None:
+                    supabase_url = os.getenv("SUPABASE_URL")
+                    # Use service role key for admin operations (creating tables, etc.)
+                    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+                    
+                    if supabase_url and supabase_key:
+                        try:
+                            cls._supabase_client = create_client(supabase_url, supabase_key)
+                            print("✓ Connected to Supabase SQL")
+                        except Exception as e:
+                            print(f"⚠ Could not connect to Supabase SQL: {e}")
+        
+        return cls._supabase_client
+    
+    @staticmethod
+    def compute_file_hash(file_path: str) -> str:
+        """Compute SHA-256 hash of a file in 1 MB chunks"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+    
+    def infer_schema_cached(self, sha256_hash: str, parsed_data: Any, file_type: str,
+                            analysis: Dict[str, Any],
+                            custom_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Infer schema, reusing a previous result for an identical file
+        
+        Args:
+            sha256_hash: SHA-256 of the file contents
+            parsed_data: Parsed data
+            file_type: File type (json, csv, xml)
+            analysis: Analysis from SchemaAnalyzer
+            custom_metadata: Custom metadata (hints affect the inferred schema)
             
-            if supabase_url and supabase_key:
-                try:
-                    self._supabase_client = create_client(supabase_url, supabase_key)
-                    print("✓ Connected to Supabase SQL")
-                except Exception as e:
-                    print(f"⚠ Could not connect to Supabase SQL: {e}")
+        Returns:
+            Detailed schema specification
+        """
+        hints = {}
+        if custom_metadata:
+            hints = {
+                'hints': custom_metadata.get('hints', {}),
+                'description': custom_metadata.get('description', ''),
+                'tags': custom_metadata.get('tags', []),
+            }
+        key = (sha256_hash, file_type, json.dumps(hints, sort_keys=True, default=str))
+        
+        with _schema_cache_lock:
+            cached = _schema_cache.get(key)
+            if cached is not None:
+                _schema_cache.move_to_end(key)
+        
+        if cached is None:
+            cached = self.schema_inferrer.infer_schema(parsed_data, file_type, analysis)
+            with _schema_cache_lock:
+                _schema_cache[key] = cached
+                if len(_schema_cache) > SCHEMA_CACHE_SIZE:
+                    _schema_cache.popitem(last=False)
+        else:
+            print("   ✓ Reusing cached schema (identical file seen before)")
         
-        return self._supabase_client
+        schema = copy.deepcopy(cached)
+        schema['created_at'] = datetime.utcnow().isoformat()
+        return schema
     
     def get_postgres_connection(self):
         """Get direct PostgreSQL connection for executing raw SQL"""
@@ -1138,13 +1332,53 @@ class StructuredDataProcessor:
             print(f"  ℹ️  Try running this SQL manually in Supabase SQL Editor")
             return None
     
+    def _get_rest_client(self):
+        """Get httpx client bound to the Supabase PostgREST endpoint (shared, keep-alive)"""
+        cls = StructuredDataProcessor
+        if cls._rest_client is None and HTTPX_AVAILABLE:
+            with cls._supabase_lock:
+                if cls._rest_client is None:
+                    supabase_url = os.getenv("SUPABASE_URL")
+                    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+                    
+                    if supabase_url and supabase_key:
+                        cls._rest_client = httpx.Client(
+                            base_url=f"{supabase_url.rstrip('/')}/rest/v1",
+                            headers={
+                                'apikey': supabase_key,
+                                'Authorization': f"Bearer {supabase_key}",
+                                'Content-Type': 'application/json',
+                                'Prefer': 'return=minimal',
+                            },
+                            timeout=60.0,
+                        )
+        
+        return cls._rest_client
+    
     # ========================================================================
     # FILE PARSING
     # ========================================================================
     
-    def parse_json(self, file_path: str) -> Any:
-        """Parse and validate JSON file"""
+    def parse_json(self, file_path: str, file_size: Optional[int] = None) -> Any:
+        """
+        Parse and validate JSON file (large top-level arrays are streamed)
+        
+        Args:
+            file_path: Path to the JSON file
+            file_size: Size in bytes if the caller already stat'd the file
+        """
         try:
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
+            
+            if IJSON_AVAILABLE and file_size > JSON_STREAMING_THRESHOLD:
+                with open(file_path, 'rb') as f:
+                    first_char = f.read(64).lstrip()[:1]
+                if first_char == b'[':
+                    streamed = StreamedJsonArray(file_path)
+                    streamed.validate()
+                    return streamed
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -1157,6 +1391,8 @@ class StructuredDataProcessor:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format: {str(e)}")
         except Exception as e:
+            if IJSON_AVAILABLE and isinstance(e, ijson.JSONError):
+                raise ValueError(f"Invalid JSON format: {str(e)}")
             raise Exception(f"Error parsing JSON: {str(e)}")
     
     def parse_csv(self, file_path: str) -> Dict[str, Any]:
@@ -1171,11 +1407,12 @@ class StructuredDataProcessor:
                     'column_count': len(df.columns),
                 }
             else:
-                # Fallback to csv module
-                with open(file_path, 'r', encoding='utf-8') as f:
+                # Fallback to csv module (header comes straight from the reader,
+                # so header-only files still report their columns)
+                with open(file_path, 'r', encoding='utf-8', newline='') as f:
                     reader = csv.DictReader(f)
+                    columns = list(reader.fieldnames or [])
                     data = list(reader)
-                    columns = list(data[0].keys()) if data else []
                     
                     return {
                         'columns': columns,
@@ -1237,6 +1474,9 @@ class StructuredDataProcessor:
         Returns:
             Storage result
         """
+        # A streamed array cannot be stored as one MongoDB document
+        can_fall_back = not isinstance(data, StreamedJsonArray)
+        
         try:
             supabase = self.get_supabase_client()
             
@@ -1244,7 +1484,7 @@ class StructuredDataProcessor:
                 return {
                     'success': False,
                     'error': 'Supabase not available',
-                    'fallback_to_nosql': True,
+                    'fallback_to_nosql': can_fall_back,
         }
         
             # Step 1: Ensure table exists using direct PostgreSQL connection
@@ -1318,45 +1558,73 @@ class StructuredDataProcessor:
             # Extract user_id from custom metadata
             user_id = custom_metadata.get('user_id') if custom_metadata else None
             if not user_id:
-                print("    ⚠ Warning: No user_id provided, falling back to MongoDB")
+                print("    ⚠ Warning: No user_id provided for SQL storage")
                 return {
                     'success': False,
                     'error': 'user_id is required for SQL storage',
-                    'fallback_to_nosql': True,
+                    'fallback_to_nosql': can_fall_back,
                 }
             
             try:
-                if isinstance(data, list):
-                    # Insert array of objects
-                    batch_size = 100
-                    for i in range(0, len(data), batch_size):
-                        batch = data[i:i + batch_size]
+                if isinstance(data, (list, StreamedJsonArray)):
+                    # Insert array of objects (streamed arrays are never fully materialized)
+                    batch_size = 1000
+                    created_at = datetime.utcnow().isoformat()
+                    rest_client = self._get_rest_client()
+                    
+                    # Streamed arrays are iterated one element at a time by ijson
+                    rows = (
+                        _dumps(item if isinstance(item, dict) else {'value': item})
+                        for item in data
+                    )
+                    
+                    # Without msgspec, splice rows after the constant part of every record,
+                    # serialized once: {"file_id":..,"user_id":..,"created_at":..,"row_index":
+                    record_prefix = None if MSGSPEC_AVAILABLE else _dumps({
+                        'file_id': file_id,
+                        'user_id': user_id,
+                        'created_at': created_at,
+                    })[:-1] + b',"row_index":'
+                    i = 0
+                    
+                    while True:
+                        batch = list(islice(rows, batch_size))
+                        if not batch:
+                            break
                         
-                        # Prepare records with file_id and user_id
-                        records = []
-                        for idx, item in enumerate(batch):
-                            record = {
-                                'file_id': file_id,
-                                'user_id': user_id,
-                                'row_index': i + idx,
-                                'data': item if isinstance(item, dict) else {'value': item},
-                                'created_at': datetime.utcnow().isoformat(),
-                            }
-                            records.append(record)
+                        # Encode the whole batch as one payload and POST it straight to PostgREST
+                        if MSGSPEC_AVAILABLE:
+                            payload = msgspec.json.encode([
+                                StructuredDataRow(file_id, user_id, i + idx, msgspec.Raw(row), created_at)
+                                for idx, row in enumerate(batch)
+                            ])
+                        else:
+                            payload = b'[' + b','.join(
+                                record_prefix + str(i + idx).encode() + b',"data":' + row + b'}'
+                                for idx, row in enumerate(batch)
+                            ) + b']'
                         
                         try:
                             # Insert into 'structured_data' table
-                            result = supabase.table('structured_data').insert(records).execute()
-                            rows_inserted += len(records)
-                            print(f"    ✓ Inserted batch: {len(records)} rows")
+                            if rest_client is not None:
+                                response = rest_client.post('/structured_data', content=payload)
+                                response.raise_for_status()
+                            else:
+                                supabase.table('structured_data').insert(json.loads(payload)).execute()
+                            rows_inserted += len(batch)
+                            i += len(batch)
+                            print(f"    ✓ Inserted batch: {len(batch)} rows")
                         except Exception as e:
                             print(f"    ⚠ Error inserting batch: {e}")
-                            print(f"    → Falling back to MongoDB storage...")
+                            if rows_inserted:
+                                self._delete_sql_rows(file_id)
+                            if can_fall_back:
+                                print(f"    → Falling back to MongoDB storage...")
                             # Don't try individual inserts, just note the error
                             return {
                                 'success': False,
                                 'error': str(e),
-                                'fallback_to_nosql': True,
+                                'fallback_to_nosql': can_fall_back,
                                 'note': 'Supabase table may not exist. Create it manually or use NoSQL storage.'
                             }
                 
@@ -1384,10 +1652,12 @@ class StructuredDataProcessor:
                         }
             except Exception as e:
                 print(f"    ⚠ Unexpected error: {e}")
+                if rows_inserted:
+                    self._delete_sql_rows(file_id)
                 return {
                     'success': False,
                     'error': str(e),
-                    'fallback_to_nosql': True,
+                    'fallback_to_nosql': can_fall_back,
                 }
             
             return {
@@ -1402,9 +1672,21 @@ class StructuredDataProcessor:
             return {
                 'success': False,
                 'error': str(e),
-                'fallback_to_nosql': True,
+                'fallback_to_nosql': can_fall_back,
             }
     
+    def _delete_sql_rows(self, file_id: str):
+        """Best-effort removal of the rows already inserted for a file whose insert failed part-way"""
+        try:
+            rest_client = self._get_rest_client()
+            if rest_client is not None:
+                rest_client.delete('/structured_data', params={'file_id': f'eq.{file_id}'}).raise_for_status()
+            else:
+                self.get_supabase_client().table('structured_data').delete().eq('file_id', file_id).execute()
+            print(f"    ✓ Removed partially inserted rows")
+        except Exception as e:
+            print(f"    ⚠ Could not remove partially inserted rows: {e}")
+    
     def store_in_mongodb(self, file_id: str, data: Any, schema: Dict[str, Any],
                         nosql_schema: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1426,6 +1708,12 @@ class StructuredDataProcessor:
                     'error': 'MongoDB not available',
                 }
             
+            if isinstance(data, StreamedJsonArray):
+                return {
+                    'success': False,
+                    'error': 'JSON array too large for a single MongoDB document',
+                }
+            
             collection = self.db_storage.collection
             
             # Step 1: Create indexes
@@ -1494,6 +1782,10 @@ class StructuredDataProcessor:
         errors = []
         warnings = []
         
+        if isinstance(data, StreamedJsonArray):
+            warnings.append(f"Large file: validated first {len(data.head)} rows only")
+            data = data.head
+        
         try:
             if isinstance(data, list):
                 # Validate array structure
@@ -1542,9 +1834,10 @@ class StructuredDataProcessor:
             output_path = str(Config.COMPRESSED_DIR / f"{Path(file_path).stem}_compressed.gz")
         
         try:
+            # Copy in 1 MB chunks; level 6 is ~3x cheaper than 9 for <2% size on text
             with open(file_path, 'rb') as f_in:
-                with gzip.open(output_path, 'wb', compresslevel=9) as f_out:
-                    f_out.writelines(f_in)
+                with gzip.open(output_path, 'wb', compresslevel=6) as f_out:
+                    shutil.copyfileobj(f_in, f_out, length=1 << 20)
             
             output_size = os.path.getsize(output_path)
             compression_ratio = (1 - output_size / input_size) * 100
@@ -1561,15 +1854,20 @@ class StructuredDataProcessor:
         except Exception as e:
             raise Exception(f"Error compressing file: {str(e)}")
     
-    def extract_metadata(self, file_path: str, parsed_data: Any, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def extract_metadata(self, file_path: str, parsed_data: Any, schema: Dict[str, Any],
+                         file_hash: Optional[str] = None,
+                         file_stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
         """Extract comprehensive metadata"""
-        file_ext = Path(file_path).suffix.lower()
+        path = Path(file_path)
+        file_ext = path.suffix.lower()
+        if file_stat is None:
+            file_stat = path.stat()
         
         metadata = {
             'type': 'structured_data',
             'file_type': 'structured_data',
-            'file_name': os.path.basename(file_path),
-            'file_size': os.path.getsize(file_path),
+            'file_name': path.name,
+            'file_size': file_stat.st_size,
             'file_extension': file_ext,
             'extension': file_ext,
             'extracted_at': datetime.utcnow().isoformat(),
@@ -1577,13 +1875,15 @@ class StructuredDataProcessor:
         }
         
         # Compute SHA-256 hash for deduplication
-        with open(file_path, 'rb') as f:
-            file_hash = hashlib.sha256(f.read()).hexdigest()
+        if file_hash is None:
+            file_hash = self.compute_file_hash(file_path)
         metadata['sha256_hash'] = file_hash
         
         # Add data statistics
         if isinstance(parsed_data, list):
             metadata['record_count'] = len(parsed_data)
+        elif isinstance(parsed_data, StreamedJsonArray):
+            metadata['record_count'] = parsed_data.row_count
         elif isinstance(parsed_data, dict):
             metadata['record_count'] = 1
             metadata['field_count'] = len(parsed_data)
@@ -1619,13 +1919,17 @@ class StructuredDataProcessor:
             Comprehensive processing result
         """
         try:
-            file_path = str(Path(file_path).absolute())
+            # Resolve the path and stat the file once for the whole pipeline
+            path = Path(file_path).absolute()
+            file_path = str(path)
+            file_stat = path.stat()
+            file_name = path.name
+            file_ext = path.suffix.lower()
             file_id = str(uuid.uuid4())
-            file_ext = Path(file_path).suffix.lower()
             
             print(f"\n{'='*70}")
             print(f"🗂️  STRUCTURED DATA PIPELINE")
-            print(f"File: {os.path.basename(file_path)}")
+            print(f"File: {file_name}")
             print(f"File ID: {file_id}")
             print(f"{'='*70}\n")
             
@@ -1644,7 +1948,7 @@ class StructuredDataProcessor:
             file_type = None
             
             if file_ext == '.json':
-                parsed_data = self.parse_json(file_path)
+                parsed_data = self.parse_json(file_path, file_stat.st_size)
                 file_type = 'json'
             elif file_ext == '.csv':
                 parsed_data = self.parse_csv(file_path)
@@ -1657,6 +1961,8 @@ class StructuredDataProcessor:
             
             print(f"   ✓ Parsed {file_type.upper()} successfully")
             
+            file_hash = self.compute_file_hash(file_path)
+            
             # ================================================================
             # STEP 2: Analyze JSON structure
             # ================================================================
@@ -1688,12 +1994,21 @@ class StructuredDataProcessor:
             result['decision_reason'] = reason
             result['decision_recommendations'] = recommendations
             
+            # Streamed arrays have no NoSQL fallback, so check SQL storage is usable
+            # before anything is written to Pinecone, S3 or the metadata store
+            if isinstance(parsed_data, StreamedJsonArray):
+                if not (custom_metadata or {}).get('user_id'):
+                    raise ValueError("user_id is required to store a streamed JSON array in SQL")
+                if not self.get_supabase_client():
+                    raise ValueError("Supabase is required to store a streamed JSON array "
+                                     "(too large for a single MongoDB document)")
+            
             # ================================================================
             # STEP 4: Infer schema
             # ================================================================
             print("\n📐 Step 4: Inferring schema...")
             
-            schema = self.schema_inferrer.infer_schema(parsed_data, file_type, analysis)
+            schema = self.infer_schema_cached(file_hash, parsed_data, file_type, analysis, custom_metadata)
             
             if schema.get('tables'):
                 print(f"   ✓ Inferred {len(schema['tables'])} table(s)")
@@ -1773,9 +2088,10 @@ class StructuredDataProcessor:
                             'file_id': file_id,
                             'type': 'structured',
                             'format': file_ext.replace('.', ''),
-                            'original_name': os.path.basename(file_path),
+                            'original_name': file_name,
                             'model': embedding_result.get('model', 'SentenceTransformer'),
                             'storage_backend': storage_backend,
+                            'user_id': (custom_metadata or {}).get('user_id', ''),
                         }
                         
                         pinecone_result = pinecone_storage.upsert_embedding(
@@ -1826,7 +2142,7 @@ class StructuredDataProcessor:
                 metadata={
                     'file_id': file_id,
                     'user_id': user_id,
-                    'original_name': os.path.basename(file_path),
+                    'original_name': file_name,
                     'type': 'structured_data',
                     'storage_backend': storage_backend,
                 }
@@ -1864,6 +2180,9 @@ class StructuredDataProcessor:
                 elif data_storage_result.get('success'):
                     print(f"   ✓ Data stored in Supabase SQL")
                     print(f"   ✓ Inserted {data_storage_result.get('rows_inserted', 0)} row(s)")
+                elif isinstance(parsed_data, StreamedJsonArray):
+                    # No NoSQL fallback for streamed arrays: fail instead of reporting success
+                    raise Exception(f"SQL storage of streamed JSON array failed: {data_storage_result.get('error')}")
             
             if storage_backend == 'nosql':
                 # Store in MongoDB
@@ -1882,7 +2201,7 @@ class StructuredDataProcessor:
             # ================================================================
             print("\n📝 Step 10: Storing metadata...")
             
-            metadata = self.extract_metadata(file_path, parsed_data, schema)
+            metadata = self.extract_metadata(file_path, parsed_data, schema, file_hash, file_stat)
             
             if custom_metadata:
                 metadata['custom'] = custom_metadata
@@ -1942,6 +2261,88 @@ class StructuredDataProcessor:
                 'error': f"Structured data processing failed: {str(e)}",
                 'file_path': file_path,
             }
+    
+    def process_many(self, file_paths: List[str],
+                     compress: bool = True,
+                     custom_metadata: Optional[Dict[str, Any]] = None,
+                     generate_embeddings: bool = True,
+                     max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process several structured data files in parallel worker processes
+        
+        S3/MongoDB/Supabase clients (and their locks) are not fork-safe, so
+        workers are started with ``spawn`` and each builds its own processor
+        and clients from scratch. Call this from under an
+        ``if __name__ == "__main__":`` guard.
+        
+        With generate_embeddings=True every worker loads its own copy of the
+        embedding models (roughly 1-2 GB each), which is why the default
+        worker count is capped at MAX_DEFAULT_WORKERS.
+        
+        Args:
+            file_paths: Paths to structured data files
+            compress: Whether to compress the files
+            custom_metadata: Additional metadata and hints (applied to every file)
+            generate_embeddings: Whether to generate embeddings
+            max_workers: Worker process count (defaults to min(CPU count, MAX_DEFAULT_WORKERS))
+            
+        Returns:
+            Processing results in the same order as file_paths
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS, max(len(file_paths), 1))
+        
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_worker_init) as executor:
+            futures = {
+                executor.submit(_process_in_worker, file_path, compress,
+                                custom_metadata, generate_embeddings): idx
+                for idx, file_path in enumerate(file_paths)
+            }
+            
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    results[idx] = {
+                        'success': False,
+                        'error': f"Structured data processing failed: {str(e)}",
+                        'file_path': file_paths[idx],
+                    }
+        
+        return results
+
+
+# ============================================================================
+# PARALLEL WORKERS
+# ============================================================================
+
+# Default cap on process_many workers (each may hold its own embedding models)
+MAX_DEFAULT_WORKERS = 4
+
+# Per-process processor, created by the ProcessPoolExecutor initializer
+_worker_processor: Optional[StructuredDataProcessor] = None
+
+def _worker_init():
+    """Build a processor (and storage clients) in each spawned worker process"""
+    global _worker_processor
+    _worker_processor = StructuredDataProcessor()
+
+
+def _process_in_worker(file_path: str, compress: bool,
+                       custom_metadata: Optional[Dict[str, Any]],
+                       generate_embeddings: bool) -> Dict[str, Any]:
+    """Run the pipeline for one file on this worker's processor"""
+    return _worker_processor.process_structured_data(
+        file_path,
+        compress=compress,
+        custom_metadata=custom_metadata,
+        generate_embeddings=generate_embeddings,
+    )
 
 
 # ============================================================================
@@ -2,33 +2,52 @@
 Test script for batch/folder upload functionality
 Demonstrates parallel processing and progress tracking
 """
+import asyncio
+import io
 import requests
+import aiohttp
+import orjson
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 import os
 import time
 import json
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 API_URL = "http://localhost:8000"
 
+# Endpoint URLs, built once
+HEALTH_URL = f"{API_URL}/health"
+UPLOAD_URL = f"{API_URL}/upload"
+BATCH_URL = f"{API_URL}/upload/batch"
+BATCHES_LIST_URL = f"{API_URL}/batches?limit=5"
 
-def create_test_files():
-    """Create a test folder with diverse file types"""
-    test_folder = Path("test_batch_upload")
-    test_folder.mkdir(exist_ok=True)
-    
-    files_created = []
-    
-    # Create test files of different types
-    
+
+def batch_status_url(batch_id):
+    """URL of a batch's status endpoint"""
+    return f"{API_URL}/batch/{batch_id}"
+
+
+def _json(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+
+# Shared session so back-to-back calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=0)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Test files of different types, kept in memory as (name, bytes, content_type)
+TEST_PAYLOADS = [
     # 1. Text file
-    text_file = test_folder / "document.txt"
-    text_file.write_text("This is a test document for batch upload testing.\nIt contains multiple lines of text.")
-    files_created.append(text_file)
+    ('document.txt',
+     b"This is a test document for batch upload testing.\nIt contains multiple lines of text.",
+     'text/plain'),
     
     # 2. Python code
-    code_file = test_folder / "script.py"
-    code_file.write_text("""
+    ('script.py', b"""
 def hello_world():
     '''A simple test function'''
     print("Hello from batch upload!")
@@ -36,45 +55,37 @@ def hello_world():
 
 if __name__ == "__main__":
     hello_world()
-""")
-    files_created.append(code_file)
+""", 'text/x-python'),
     
     # 3. JSON file
-    json_file = test_folder / "data.json"
-    json_file.write_text(json.dumps({
+    ('data.json', json.dumps({
         "users": [
             {"name": "Alice", "age": 30, "city": "New York"},
             {"name": "Bob", "age": 25, "city": "San Francisco"}
         ],
         "timestamp": "2025-11-12T10:30:00Z"
-    }, indent=2))
-    files_created.append(json_file)
+    }, indent=2).encode(), 'application/json'),
     
     # 4. CSV file
-    csv_file = test_folder / "sales.csv"
-    csv_file.write_text("""product,quantity,price
+    ('sales.csv', b"""product,quantity,price
 Laptop,5,1200
 Mouse,20,25
 Keyboard,15,75
 Monitor,8,300
-""")
-    files_created.append(csv_file)
+""", 'text/csv'),
     
     # 5. Markdown file (generic)
-    md_file = test_folder / "readme.md"
-    md_file.write_text("""# Test Batch Upload
+    ('readme.md', b"""# Test Batch Upload
 
 This folder contains various file types for testing:
 - Documents
 - Code
 - Structured data
 - More...
-""")
-    files_created.append(md_file)
+""", 'text/markdown'),
     
     # 6. JavaScript code
-    js_file = test_folder / "app.js"
-    js_file.write_text("""
+    ('app.js', b"""
 function processData(data) {
     console.log("Processing:", data);
     return data.map(item => item * 2);
@@ -83,244 +94,246 @@ function processData(data) {
 const numbers = [1, 2, 3, 4, 5];
 const result = processData(numbers);
 console.log("Result:", result);
-""")
-    files_created.append(js_file)
-    
-    print(f"\n✓ Created {len(files_created)} test files in '{test_folder}'")
-    for f in files_created:
-        print(f"  - {f.name} ({f.stat().st_size} bytes)")
-    
-    return test_folder, files_created
+""", 'application/javascript'),
+]
 
 
-def test_batch_upload():
+def test_batch_upload(payloads):
     """Test batch upload endpoint"""
     print("\n" + "="*70)
     print("TEST: Batch Upload with Multiple File Types")
     print("="*70)
     
-    # Create test files
-    test_folder, files_created = create_test_files()
+    # Prepare files for upload straight from memory
+    files_to_upload = [
+        ('files', (name, io.BytesIO(data), content_type))
+        for name, data, content_type in payloads
+    ]
     
-    try:
-        # Prepare files for upload
-        files_to_upload = []
-        for file_path in files_created:
-            files_to_upload.append(
-                ('files', (file_path.name, open(file_path, 'rb'), 'application/octet-stream'))
-            )
+    # Upload batch
+    print("\n📤 Uploading batch...")
+    start_time = time.time()
+    
+    # Encode the multipart body lazily as it is sent rather than building it up front
+    encoder = MultipartEncoder(fields=files_to_upload + [
+        ('batch_name', 'Test Batch Upload'),
+        ('user_id', 'test_user_123'),
+        ('compress', 'true'),
+        ('generate_embeddings', 'true'),
+        ('max_concurrent', '3'),
+    ])
+    
+    response = SESSION.post(
+        BATCH_URL,
+        data=encoder,
+        headers={'Content-Type': encoder.content_type}
+    )
+    
+    elapsed_time = time.time() - start_time
+    
+    if response.status_code == 201:
+        result = _json(response)
         
-        # Upload batch
-        print("\n📤 Uploading batch...")
-        start_time = time.time()
+        print(f"\n✅ Batch upload completed in {elapsed_time:.2f}s")
+        print(f"\nBatch ID: {result['batch_id']}")
+        print(f"Batch Name: {result['batch_name']}")
+        print(f"Total Files: {result['total_files']}")
+        print(f"Successful: {result['successful']}")
+        print(f"Failed: {result['failed']}")
+        print(f"Progress: {result['progress_percentage']}%")
         
-        response = requests.post(
-            f"{API_URL}/upload/batch",
-            files=files_to_upload,
-            data={
-                'batch_name': 'Test Batch Upload',
-                'user_id': 'test_user_123',
-                'compress': 'true',
-                'generate_embeddings': 'true',
-                'max_concurrent': '3'
-            }
-        )
+        print("\n📊 File-by-File Results:")
+        print("-" * 70)
+        for file_info in result['files']:
+            status_icon = "✓" if file_info['status'] == 'success' else "✗"
+            print(f"{status_icon} {file_info['filename']:20s} → {file_info.get('pipeline', 'N/A'):20s}", end='')
+            
+            if file_info['status'] == 'success':
+                if 'compression_ratio' in file_info:
+                    print(f" (compressed: {file_info['compression_ratio']:.1f}%)")
+                else:
+                    print()
+            else:
+                print(f" [ERROR: {file_info.get('error', 'Unknown')}]")
         
-        # Close file handles
-        for _, (_, file_obj, _) in files_to_upload:
-            file_obj.close()
+        batch_id = result['batch_id']
         
-        elapsed_time = time.time() - start_time
+        # The three lookups are independent GETs - issue them concurrently
+        status_url = batch_status_url(batch_id)
+        urls = {
+            'status': status_url,
+            'files': f"{status_url}/files",
+            'list': BATCHES_LIST_URL,
+        }
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(SESSION.get, url): name for name, url in urls.items()}
+            responses = {futures[future]: future.result() for future in as_completed(futures)}
         
-        if response.status_code == 201:
-            result = response.json()
-            
-            print(f"\n✅ Batch upload completed in {elapsed_time:.2f}s")
-            print(f"\nBatch ID: {result['batch_id']}")
-            print(f"Batch Name: {result['batch_name']}")
-            print(f"Total Files: {result['total_files']}")
-            print(f"Successful: {result['successful']}")
-            print(f"Failed: {result['failed']}")
-            print(f"Progress: {result['progress_percentage']}%")
-            
-            print("\n📊 File-by-File Results:")
-            print("-" * 70)
-            for file_info in result['files']:
-                status_icon = "✓" if file_info['status'] == 'success' else "✗"
-                print(f"{status_icon} {file_info['filename']:20s} → {file_info.get('pipeline', 'N/A'):20s}", end='')
-                
-                if file_info['status'] == 'success':
-                    if 'compression_ratio' in file_info:
-                        print(f" (compressed: {file_info['compression_ratio']:.1f}%)")
-                    else:
-                        print()
-                else:
-                    print(f" [ERROR: {file_info.get('error', 'Unknown')}]")
-            
-            batch_id = result['batch_id']
-            
-            # Test batch status endpoint
-            print("\n" + "="*70)
-            print("TEST: Get Batch Status")
-            print("="*70)
-            
-            status_response = requests.get(f"{API_URL}/batch/{batch_id}")
-            if status_response.status_code == 200:
-                status = status_response.json()
-                print(f"\n✅ Batch Status Retrieved")
-                print(f"Status: {status['status']}")
-                print(f"Processed: {status['processed_files']}/{status['total_files']}")
-                print(f"Successful: {status['successful_files']}")
-                print(f"Failed: {status['failed_files']}")
-                print(f"Created: {status['created_at']}")
-                if status.get('completed_at'):
-                    print(f"Completed: {status['completed_at']}")
-            
-            # Test get batch files endpoint
-            print("\n" + "="*70)
-            print("TEST: Get Batch Files")
-            print("="*70)
-            
-            files_response = requests.get(f"{API_URL}/batch/{batch_id}/files")
-            if files_response.status_code == 200:
-                files_data = files_response.json()
-                print(f"\n✅ Retrieved {files_data['count']} files from batch")
-                
-                for file_record in files_data['files'][:3]:  # Show first 3
-                    print(f"\n  File: {file_record.get('filename', 'N/A')}")
-                    print(f"    ID: {file_record.get('file_id', 'N/A')}")
-                    print(f"    Type: {file_record.get('file_type', 'N/A')}")
-                    print(f"    Size: {file_record.get('file_size', 0)} bytes")
-            
-            # Test list batches endpoint
-            print("\n" + "="*70)
-            print("TEST: List All Batches")
-            print("="*70)
-            
-            list_response = requests.get(f"{API_URL}/batches?limit=5")
-            if list_response.status_code == 200:
-                batches_data = list_response.json()
-                print(f"\n✅ Found {batches_data['count']} recent batches:")
-                
-                for batch in batches_data['batches']:
-                    print(f"\n  {batch['batch_name']}")
-                    print(f"    ID: {batch['batch_id']}")
-                    print(f"    Files: {batch['processed_files']}/{batch['total_files']}")
-                    print(f"    Status: {batch['status']}")
-                    print(f"    Progress: {batch.get('progress_percentage', 0):.1f}%")
-            
-            # Test batch deletion (optional, uncomment if desired)
-            # print("\n" + "="*70)
-            # print("TEST: Delete Batch")
-            # print("="*70)
-            # 
-            # delete_response = requests.delete(f"{API_URL}/batch/{batch_id}")
-            # if delete_response.status_code == 200:
-            #     delete_result = delete_response.json()
-            #     print(f"\n✅ Batch deleted successfully")
-            #     print(f"Deleted files: {delete_result['deleted_files']}")
-            #     print(f"Failed deletions: {delete_result['failed_deletions']}")
+        # Test batch status endpoint
+        print("\n" + "="*70)
+        print("TEST: Get Batch Status")
+        print("="*70)
+        
+        status_response = responses['status']
+        if status_response.status_code == 200:
+            status = _json(status_response)
+            print(f"\n✅ Batch Status Retrieved")
+            print(f"Status: {status['status']}")
+            print(f"Processed: {status['processed_files']}/{status['total_files']}")
+            print(f"Successful: {status['successful_files']}")
+            print(f"Failed: {status['failed_files']}")
+            print(f"Created: {status['created_at']}")
+            if status.get('completed_at'):
+                print(f"Completed: {status['completed_at']}")
+        
+        # Test get batch files endpoint
+        print("\n" + "="*70)
+        print("TEST: Get Batch Files")
+        print("="*70)
+        
+        files_response = responses['files']
+        if files_response.status_code == 200:
+            files_data = _json(files_response)
+            print(f"\n✅ Retrieved {files_data['count']} files from batch")
             
-            print("\n" + "="*70)
-            print("✅ ALL BATCH TESTS PASSED!")
-            print("="*70)
+            for file_record in files_data['files'][:3]:  # Show first 3
+                print(f"\n  File: {file_record.get('filename', 'N/A')}")
+                print(f"    ID: {file_record.get('file_id', 'N/A')}")
+                print(f"    Type: {file_record.get('file_type', 'N/A')}")
+                print(f"    Size: {file_record.get('file_size', 0)} bytes")
+        
+        # Test list batches endpoint
+        print("\n" + "="*70)
+        print("TEST: List All Batches")
+        print("="*70)
+        
+        list_response = responses['list']
+        if list_response.status_code == 200:
+            batches_data = _json(list_response)
+            print(f"\n✅ Found {batches_data['count']} recent batches:")
             
-        else:
-            print(f"\n❌ Batch upload failed: {response.status_code}")
-            print(response.text)
-    
-    finally:
-        # Clean up test files
-        print("\n🧹 Cleaning up test files...")
-        for file_path in files_created:
-            if file_path.exists():
-                file_path.unlink()
+            for batch in batches_data['batches']:
+                print(f"\n  {batch['batch_name']}")
+                print(f"    ID: {batch['batch_id']}")
+                print(f"    Files: {batch['processed_files']}/{batch['total_files']}")
+                print(f"    Status: {batch['status']}")
+                print(f"    Progress: {batch.get('progress_percentage', 0):.1f}%")
         
-        if test_folder.exists():
-            test_folder.rmdir()
+        # Test batch deletion (optional, uncomment if desired)
+        # print("\n" + "="*70)
+        # print("TEST: Delete Batch")
+        # print("="*70)
+        # 
+        # delete_response = SESSION.delete(status_url)
+        # if delete_response.status_code == 200:
+        #     delete_result = delete_response.json()
+        #     print(f"\n✅ Batch deleted successfully")
+        #     print(f"Deleted files: {delete_result['deleted_files']}")
+        #     print(f"Failed deletions: {delete_result['failed_deletions']}")
+        
+        print("\n" + "="*70)
+        print("✅ ALL BATCH TESTS PASSED!")
+        print("="*70)
+        
+    else:
+        print(f"\n❌ Batch upload failed: {response.status_code}")
+        print(response.text)
+
+
+async def _upload_one(session, semaphore, filename, data, content_type):
+    """Upload a single file's bytes through the /upload endpoint"""
+    async with semaphore:
+        form = aiohttp.FormData()
+        form.add_field('file', data, filename=filename, content_type=content_type)
+        form.add_field('compress', 'true')
+        form.add_field('generate_embeddings', 'true')
         
-        print("✓ Cleanup complete")
+        async with session.post(UPLOAD_URL, data=form) as response:
+            await response.read()
+            return response.status
 
 
-def test_sequential_comparison():
-    """Compare batch upload vs sequential uploads"""
+async def _upload_individually(payloads, max_concurrent=3):
+    """Upload (filename, bytes, content_type) entries one request each, overlapping up to max_concurrent requests"""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            *(_upload_one(session, semaphore, name, data, content_type)
+              for name, data, content_type in payloads)
+        )
+
+
+def test_sequential_comparison(payloads):
+    """Compare batch upload vs individual uploads"""
     print("\n" + "="*70)
-    print("BENCHMARK: Batch vs Sequential Upload")
+    print("BENCHMARK: Batch vs Individual Uploads")
     print("="*70)
     
-    # Create test files
-    test_folder, files_created = create_test_files()
+    # Test individual uploads (same concurrency as the batch endpoint)
+    print("\n⏱️ Testing Individual Uploads (3 concurrent)...")
+    sequential_start = time.perf_counter_ns()
     
-    try:
-        # Test sequential uploads
-        print("\n⏱️ Testing Sequential Uploads...")
-        sequential_start = time.time()
-        
-        for file_path in files_created:
-            with open(file_path, 'rb') as f:
-                response = requests.post(
-                    f"{API_URL}/upload",
-                    files={'file': (file_path.name, f, 'application/octet-stream')},
-                    data={
-                        'compress': 'true',
-                        'generate_embeddings': 'true'
-                    }
-                )
-        
-        sequential_time = time.time() - sequential_start
-        print(f"✓ Sequential: {sequential_time:.2f}s")
-        
-        # Test batch upload
-        print("\n⏱️ Testing Batch Upload...")
-        batch_start = time.time()
-        
-        files_to_upload = []
-        for file_path in files_created:
-            files_to_upload.append(
-                ('files', (file_path.name, open(file_path, 'rb'), 'application/octet-stream'))
-            )
-        
-        response = requests.post(
-            f"{API_URL}/upload/batch",
-            files=files_to_upload,
-            data={
-                'batch_name': 'Benchmark Batch',
-                'compress': 'true',
-                'generate_embeddings': 'true',
-                'max_concurrent': '3'
-            }
-        )
-        
-        for _, (_, file_obj, _) in files_to_upload:
-            file_obj.close()
-        
-        batch_time = time.time() - batch_start
-        print(f"✓ Batch: {batch_time:.2f}s")
-        
-        # Calculate speedup
-        speedup = sequential_time / batch_time if batch_time > 0 else 1
-        print(f"\n📈 Performance Improvement:")
-        print(f"   Sequential Time: {sequential_time:.2f}s")
-        print(f"   Batch Time: {batch_time:.2f}s")
-        print(f"   Speedup: {speedup:.2f}x faster")
-        print(f"   Time Saved: {sequential_time - batch_time:.2f}s ({((sequential_time - batch_time) / sequential_time * 100):.1f}%)")
+    individual_statuses = asyncio.run(_upload_individually(payloads, max_concurrent=3))
+    
+    sequential_time = (time.perf_counter_ns() - sequential_start) / 1e9
+    
+    # Report only after the timed region so stdout does not skew it
+    for (name, _, _), status_code in zip(payloads, individual_statuses):
+        print(f"   {name}: HTTP {status_code}")
+    print(f"✓ Individual: {sequential_time:.2f}s")
     
-    finally:
-        # Clean up
-        for file_path in files_created:
-            if file_path.exists():
-                file_path.unlink()
-        if test_folder.exists():
-            test_folder.rmdir()
+    # Build the batch request body before starting the clock
+    files_to_upload = [
+        ('files', (name, io.BytesIO(data), content_type))
+        for name, data, content_type in payloads
+    ]
+    
+    encoder = MultipartEncoder(fields=files_to_upload + [
+        ('batch_name', 'Benchmark Batch'),
+        ('compress', 'true'),
+        ('generate_embeddings', 'true'),
+        ('max_concurrent', '3'),
+    ])
+    
+    # Test batch upload
+    print("\n⏱️ Testing Batch Upload...")
+    batch_start = time.perf_counter_ns()
+    
+    response = SESSION.post(
+        BATCH_URL,
+        data=encoder,
+        headers={'Content-Type': encoder.content_type}
+    )
+    
+    batch_time = (time.perf_counter_ns() - batch_start) / 1e9
+    print(f"   Batch: HTTP {response.status_code}")
+    print(f"✓ Batch: {batch_time:.2f}s")
+    
+    # Calculate speedup
+    speedup = sequential_time / batch_time if batch_time > 0 else 1
+    print(f"\n📈 Performance Improvement:")
+    print(f"   Individual Time: {sequential_time:.2f}s")
+    print(f"   Batch Time: {batch_time:.2f}s")
+    print(f"   Speedup: {speedup:.2f}x faster")
+    print(f"   Time Saved: {sequential_time - batch_time:.2f}s ({((sequential_time - batch_time) / sequential_time * 100):.1f}%)")
 
 
 if __name__ == "__main__":
+    # Prefer the libuv-based event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     print("\n🚀 Starting Batch Upload Tests...")
     print(f"API URL: {API_URL}")
     
     # Check if API is running
     try:
-        response = requests.get(f"{API_URL}/health")
+        response = SESSION.get(HEALTH_URL)
         if response.status_code != 200:
             print("❌ API is not healthy!")
             exit(1)
@@ -331,11 +344,15 @@ if __name__ == "__main__":
     
     print("✓ API is healthy\n")
     
+    print(f"✓ Using {len(TEST_PAYLOADS)} in-memory test files")
+    for name, data, _ in TEST_PAYLOADS:
+        print(f"  - {name} ({len(data)} bytes)")
+    
     # Run tests
-    test_batch_upload()
+    test_batch_upload(TEST_PAYLOADS)
     
     print("\n")
-    test_sequential_comparison()
+    test_sequential_comparison(TEST_PAYLOADS)
     
     print("\n" + "="*70)
     print("🎉 All tests completed successfully!")
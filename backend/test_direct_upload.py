@@ -3,11 +3,18 @@
 Direct test of batch upload to see actual errors
 """
 import requests
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 import os
 from pathlib import Path
 
 API_BASE = "http://localhost:8000"
 
+# Shared session so back-to-back calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=0)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
 # First, get auth token (using a test user)
 print("=" * 60)
 print("TESTING BATCH UPLOAD DIRECTLY")
@@ -16,7 +23,7 @@ print()
 
 # Check if backend is running
 try:
-    health = requests.get(f"{API_BASE}/health", timeout=5)
+    health = SESSION.get(f"{API_BASE}/health", timeout=5)
     print(f"✅ Backend is running: {health.json()}")
 except Exception as e:
     print(f"❌ Backend is not running: {e}")
@@ -30,12 +37,15 @@ print()
 
 test_file = Path(__file__).parent / "test.jpg"
 
-if not test_file.exists():
+# One stat both checks the file exists and gives its size
+try:
+    test_file_size = test_file.stat().st_size
+except FileNotFoundError:
     print(f"❌ Test file not found: {test_file}")
     exit(1)
 
 print(f"📁 Test file: {test_file}")
-print(f"📊 Size: {test_file.stat().st_size / 1024:.2f} KB")
+print(f"📊 Size: {test_file_size / 1024:.2f} KB")
 print()
 
 # Try batch upload (this requires auth, so this will fail with 401)
@@ -43,23 +53,21 @@ print()
 print("Testing batch upload endpoint...")
 print()
 
-files = {
-    'files': ('test.jpg', open(test_file, 'rb'), 'image/jpeg')
-}
-
-data = {
-    'batch_name': 'Direct Test Upload',
-    'compress': 'true',
-    'generate_embeddings': 'true'
-}
-
 try:
-    response = requests.post(
-        f"{API_BASE}/upload/batch",
-        files=files,
-        data=data,
-        timeout=60
-    )
+    # Stream the multipart body from the open file and close it afterwards
+    with open(test_file, 'rb') as fh:
+        encoder = MultipartEncoder(fields={
+            'files': ('test.jpg', fh, 'image/jpeg'),
+            'batch_name': 'Direct Test Upload',
+            'compress': 'true',
+            'generate_embeddings': 'true'
+        })
+        response = SESSION.post(
+            f"{API_BASE}/upload/batch",
+            data=encoder,
+            headers={'Content-Type': encoder.content_type},
+            timeout=60
+        )
     
     print(f"Status Code: {response.status_code}")
     print()
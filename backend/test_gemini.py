@@ -13,15 +13,21 @@ def main():
     
     embedding_service = get_embedding_service()
     
-    # Test text embedding
-    print("\n1️⃣  Testing text embedding...")
-    text_emb = embedding_service.generate_text_embedding("a beautiful girl with red dress")
+    # Test text embeddings (all texts in one batched call)
+    print("\n1️⃣  Testing text embeddings...")
+    texts = [
+        "a beautiful girl with red dress",
+        "a dog playing in the park",
+        "sunset over the mountains",
+    ]
+    text_embs = embedding_service.generate_text_embeddings(texts)
     
-    if text_emb is not None:
-        print(f"   ✅ Text embedding: {len(text_emb)} dimensions")
-        print(f"   First 5 values: {text_emb[:5]}")
-    else:
-        print("   ❌ Text embedding failed")
+    for text, text_emb in zip(texts, text_embs):
+        if text_emb is not None:
+            print(f"   ✅ '{text}': {len(text_emb)} dimensions")
+            print(f"   First 5 values: {text_emb[:5]}")
+        else:
+            print(f"   ❌ '{text}': text embedding failed")
     
     print("\n" + "=" * 80)
 
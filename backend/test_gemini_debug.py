@@ -4,16 +4,19 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from google import genai
-from config import Config
+from gemini_client import get_gemini_client
 
-client = genai.Client(api_key=Config.GEMINI_API_KEY)
+# Shared client with a pooled keep-alive connection to the Gemini API
+client = get_gemini_client()
+if client is None:
+    print("❌ Gemini client unavailable: set GEMINI_API_KEY and install google-genai")
+    sys.exit(1)
 
-# Test text
-print("Testing text embedding...")
+# Test text (two inputs in one request)
+print("Testing text embeddings...")
 result = client.models.embed_content(
     model="models/embedding-001",
-    contents={"text": "hello world"}
+    contents=["hello world", "foo"]
 )
 
 print(f"Result type: {type(result)}")
@@ -26,7 +29,8 @@ if hasattr(result, 'embeddings'):
     if result.embeddings:
         print(f"First embedding type: {type(result.embeddings[0])}")
         print(f"First embedding dir: {[x for x in dir(result.embeddings[0]) if not x.startswith('_')]}")
-        if hasattr(result.embeddings[0], 'values'):
-            print(f"Values length: {len(result.embeddings[0].values)}")
-            print(f"First 5 values: {result.embeddings[0].values[:5]}")
+        for i, embedding in enumerate(result.embeddings):
+            if hasattr(embedding, 'values'):
+                print(f"[{i}] Values length: {len(embedding.values)}")
+                print(f"[{i}] First 5 values: {embedding.values[:5]}")
 
@@ -4,24 +4,24 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from google import genai
-from config import Config
+from gemini_client import get_gemini_client
 
-client = genai.Client(api_key=Config.GEMINI_API_KEY)
+# Shared client with a pooled keep-alive connection to the Gemini API
+client = get_gemini_client()
+if client is None:
+    print("❌ Gemini client unavailable: set GEMINI_API_KEY and install google-genai")
+    sys.exit(1)
 
 # Create a simple test image
 from PIL import Image
 import io
-import numpy as np
 
 # Create a simple red image
-img_array = np.zeros((100, 100, 3), dtype=np.uint8)
-img_array[:, :] = [255, 0, 0]  # Red
-img = Image.fromarray(img_array)
+img = Image.new('RGB', (100, 100), (255, 0, 0))
 
 # Save to bytes
 img_bytes_io = io.BytesIO()
-img.save(img_bytes_io, format='JPEG')
+img.save(img_bytes_io, format='JPEG', quality=85, optimize=False)
 img_bytes = img_bytes_io.getvalue()
 
 print("Testing image embedding...")
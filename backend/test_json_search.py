@@ -4,14 +4,47 @@ Test semantic search for structured JSON data
 Tests various queries against the uploaded JSON file
 """
 
+import asyncio
+import aiohttp
 import requests
+import orjson
 import json
 from typing import Dict, Any, List
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
+SEARCH_URL = f"{API_BASE_URL}/api/search"
 AUTH_TOKEN = "YOUR_AUTH_TOKEN_HERE"  # Replace with your actual token
 
+# Per-request timeout (seconds) so a hung server cannot block the run
+REQUEST_TIMEOUT = 30
+
+# Rate limiting for the full test suite
+MAX_CONCURRENT_QUERIES = 4
+MIN_REQUEST_INTERVAL = 0.125  # seconds
+
+HEADERS = {
+    "Authorization": f"Bearer {AUTH_TOKEN}",
+    "Content-Type": "application/json"
+}
+
+# Shared session so back-to-back calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=0)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Search request prepared once (URL, headers, session cookies); each call
+# copies it and swaps in its own body
+SEARCH_REQUEST = SESSION.prepare_request(requests.Request('POST', SEARCH_URL, headers=HEADERS))
+
+# send() skips the environment (proxy/CA bundle) settings that post() merges in
+SEND_SETTINGS = SESSION.merge_environment_settings(SEARCH_URL, {}, None, None, None)
+
+def _json(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
 def print_separator(title: str = ""):
     """Print a formatted separator"""
     if title:
@@ -33,12 +66,6 @@ def search(query: str, file_types: List[str] = None, limit: int = 10) -> Dict[st
     Returns:
         Search results
     """
-    url = f"{API_BASE_URL}/api/search"
-    headers = {
-        "Authorization": f"Bearer {AUTH_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "query": query,
         "limit": limit
@@ -48,15 +75,39 @@ def search(query: str, file_types: List[str] = None, limit: int = 10) -> Dict[st
         payload["file_types"] = file_types
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        request = SEARCH_REQUEST.copy()
+        request.prepare_body(data=orjson.dumps(payload), files=None)
+        response = SESSION.send(request, timeout=REQUEST_TIMEOUT, **SEND_SETTINGS)
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     except requests.exceptions.RequestException as e:
         print(f"❌ Error: {e}")
         if hasattr(e.response, 'text'):
             print(f"Response: {e.response.text}")
         return None
 
+async def search_async(session: aiohttp.ClientSession, query: str,
+                       file_types: List[str] = None, limit: int = 10) -> Dict[str, Any]:
+    """Perform semantic search on a shared aiohttp session"""
+    payload = {
+        "query": query,
+        "limit": limit
+    }
+    
+    if file_types:
+        payload["file_types"] = file_types
+    
+    try:
+        async with session.post(SEARCH_URL, data=orjson.dumps(payload), headers=HEADERS) as response:
+            if response.status >= 400:
+                print(f"❌ Error: {response.status} for '{query}'")
+                print(f"Response: {await response.text()}")
+                return None
+            return orjson.loads(await response.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"❌ Error for '{query}': {e!r}")
+        return None
+
 def display_results(results: Dict[str, Any], query: str):
     """Display search results in a formatted way"""
     if not results:
@@ -88,7 +139,7 @@ def display_results(results: Dict[str, Any], query: str):
     else:
         print("\n💭 No matching files found")
 
-def main():
+async def main():
     """Run semantic search tests"""
     
     print_separator("SEMANTIC SEARCH TEST FOR STRUCTURED JSON DATA")
@@ -141,9 +192,25 @@ Make sure to:
     success_count = 0
     total_count = len(test_queries)
     
-    for query, description in test_queries:
+    # Up to MAX_CONCURRENT_QUERIES in flight; each holds its slot for at least
+    # MIN_REQUEST_INTERVAL so the server never sees more than ~32 req/s
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    loop = asyncio.get_running_loop()
+    
+    async def run_query(session, query):
+        async with semaphore:
+            start = loop.time()
+            results = await search_async(session, query, file_types=["structured"], limit=5)
+            await asyncio.sleep(max(0, MIN_REQUEST_INTERVAL - (loop.time() - start)))
+            return results
+    
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as session:
+        all_results = await asyncio.gather(
+            *(run_query(session, query) for query, _ in test_queries)
+        )
+    
+    for (query, description), results in zip(test_queries, all_results):
         print_separator(f"Test: {description}")
-        results = search(query, file_types=["structured"], limit=5)
         
         if results and results.get('total', 0) > 0:
             success_count += 1
@@ -152,10 +219,6 @@ Make sure to:
             print("❌ NO RESULTS")
         
         display_results(results, query)
-        
-        # Small delay between requests
-        import time
-        time.sleep(0.5)
     
     # Summary
     print_separator("TEST SUMMARY")
@@ -179,11 +242,18 @@ def test_single_query(query: str):
 if __name__ == "__main__":
     import sys
     
+    # Prefer the libuv-based event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     if len(sys.argv) > 1:
         # Interactive mode: test a single query
         query = " ".join(sys.argv[1:])
         test_single_query(query)
     else:
         # Run full test suite
-        main()
+        asyncio.run(main())
 
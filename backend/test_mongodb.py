@@ -11,6 +11,9 @@ load_dotenv()
 
 MONGODB_URI = os.getenv("MONGODB_URI")
 
+# Fail fast on a dead host instead of waiting out the default selection timeout
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_PROBE_TIMEOUT_MS", 1500))
+
 print("=" * 60)
 print("TESTING MONGODB ATLAS CONNECTION")
 print("=" * 60)
@@ -44,10 +47,12 @@ try:
     # Try connection with SSL options
     client = MongoClient(
         MONGODB_URI,
-        serverSelectionTimeoutMS=10000,  # 10 seconds timeout
+        serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
         tlsAllowInvalidCertificates=True,  # For development
         retryWrites=True,
-        w='majority'
+        w='majority',
+        directConnection=False
     )
     
     # Test connection
@@ -77,7 +82,8 @@ try:
     collections = db.list_collection_names()
     if collections:
         for coll in collections:
-            count = db[coll].count_documents({})
+            # Collection metadata count - avoids a full COUNT scan
+            count = db[coll].estimated_document_count()
             print(f"   - {coll}: {count} documents")
     else:
         print("   (No collections yet)")
@@ -18,16 +18,16 @@ print("=" * 60)
 print("SEMANTIC SEARCH TEST")
 print("=" * 60)
 
-for query in queries:
+results = processor.search_similar_media_batch(
+    query_type='text',
+    queries=queries,
+    top_k=5
+)
+
+for query, result in zip(queries, results):
     print(f"\n🔍 Searching for: '{query}'")
     print("-" * 60)
     
-    result = processor.search_similar_media(
-        query_type='text',
-        query=query,
-        top_k=5
-    )
-    
     if result.get('success') and result['results']:
         print(f"✓ Found {result['count']} results:")
         for i, item in enumerate(result['results'], 1):
@@ -5,25 +5,30 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from embedding_service import get_embedding_service
-from storage_pinecone import PineconeStorage
+from embedding_client import embed_text
+from storage_pinecone import get_pinecone_storage
 
 def main():
+    """
+    Embed 'red dress' and search Pinecone with it
+    
+    Returns:
+        True if the search returned results
+    """
     print("=" * 80)
     print("🔍 Testing semantic search for 'red dress'")
     print("=" * 80)
     
-    # Initialize services
-    embedding_service = get_embedding_service()
-    pinecone_storage = PineconeStorage()
+    # Initialize services (embeddings come from the embedding server if running)
+    pinecone_storage = get_pinecone_storage()
     
     # Generate query embedding
     print("\n📝 Generating query embedding for: 'red dress'")
-    query_result = embedding_service.generate_text_embedding("red dress", use_clip=True)
+    query_result = embed_text("red dress", use_clip=True)
     
     if query_result is None:
         print("   ❌ Failed to generate query embedding")
-        return
+        return False
     
     print(f"   ✅ Query embedding: {len(query_result)} dimensions")
     
@@ -40,7 +45,7 @@ def main():
     
     if not matches:
         print("   ⚠️  No results found")
-        return
+        return False
     
     print(f"\n📊 Found {len(matches)} results:\n")
     
@@ -61,7 +66,8 @@ def main():
         print()
     
     print("=" * 80)
+    return True
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
 
@@ -4,11 +4,24 @@ Test script to upload a file to the API
 Run this AFTER starting the API server (python3 api.py)
 """
 import requests
+from urllib3.util.retry import Retry
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 import sys
 from pathlib import Path
 
 API_URL = "http://localhost:8000"
 
+# Shared session so every call reuses pooled keep-alive connections;
+# idempotent requests are retried on connection errors and gateway errors
+SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
 def test_upload(file_path):
     """Upload a file to the API"""
     
@@ -23,21 +36,21 @@ def test_upload(file_path):
     print(f"\n📤 Uploading: {file_path}")
     print(f"   API: {API_URL}/upload")
     
-    # Prepare the upload
+    # Prepare the upload (the multipart body is streamed from disk)
     with open(file_path, 'rb') as f:
-        files = {'file': (Path(file_path).name, f, 'application/octet-stream')}
-        data = {
+        encoder = MultipartEncoder(fields={
+            'file': (Path(file_path).name, f, 'application/octet-stream'),
             'compress': 'true',
             'generate_embeddings': 'true'
-        }
+        })
         
         try:
             # Upload
             print("\n⏳ Uploading and processing...")
-            response = requests.post(
+            response = SESSION.post(
                 f"{API_URL}/upload",
-                files=files,
-                data=data,
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
                 timeout=300  # 5 minutes timeout for large files
             )
             
@@ -90,7 +103,7 @@ def test_search(query):
     print(f"\n🔍 Query: '{query}'")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/search/text",
             params={'query': query, 'top_k': 5},
             timeout=30
@@ -118,7 +131,7 @@ def test_list_media():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{API_URL}/media?limit=10")
+        response = SESSION.get(f"{API_URL}/media?limit=10")
         
         if response.status_code == 200:
             result = response.json()
@@ -146,7 +159,7 @@ if __name__ == "__main__":
     
     # Check if API is running
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = SESSION.get(f"{API_URL}/health", timeout=2)
         print("✅ API server is running!\n")
     except:
         print("❌ API server is NOT running!")
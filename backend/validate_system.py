@@ -3,8 +3,70 @@ System Validation Script
 Validates that all pipelines and components can be imported and initialized
 """
 import sys
+import importlib
+import subprocess
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+
+@lru_cache(maxsize=None)
+def _probe_import(module_name, attr_name=None):
+    """
+    Import a module (and optionally look up an attribute on it)
+    
+    Returns:
+        (None, None) on success, otherwise (exception type name, exception)
+    """
+    try:
+        module = importlib.import_module(module_name)
+        if attr_name:
+            getattr(module, attr_name)
+        return None, None
+    except ImportError as e:
+        return 'ImportError', e
+    except AttributeError as e:
+        return 'AttributeError', e
+    except Exception as e:
+        return 'Exception', e
+
+
+# Subprocess probes run at once; several of them import torch, so keep this low
+MAX_PROBE_PROCESSES = 4
+
+
+@lru_cache(maxsize=None)
+def _probe_package(package):
+    """
+    Import a package in a throwaway interpreter so heavy native libraries
+    (torch, cv2, ...) never load into this process and a crashing wheel
+    cannot take the validator down with it
+    
+    Returns:
+        (None, None) on success, otherwise (failure kind, detail) where kind
+        is 'ImportError', 'Crash', 'Timeout' or 'Exception'
+    """
+    try:
+        result = subprocess.run(
+            [sys.executable, '-c', f'import {package}'],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except subprocess.TimeoutExpired:
+        return 'Timeout', 'import took longer than 30s'
+    
+    if result.returncode == 0:
+        return None, None
+    if result.returncode < 0:
+        return 'Crash', f'interpreter killed by signal {-result.returncode}'
+    
+    detail = (result.stderr.strip().splitlines() or ['unknown error'])[-1]
+    if 'ImportError' in detail or 'ModuleNotFoundError' in detail:
+        return 'ImportError', detail
+    return 'Exception', detail
+
+
 def test_imports():
     """Test if all required modules can be imported"""
     print("\n" + "="*70)
@@ -27,19 +89,21 @@ def test_imports():
     passed = 0
     failed = 0
     
-    for module_name, class_name in modules:
-        try:
-            module = __import__(module_name, fromlist=[class_name])
-            getattr(module, class_name)
+    # Import one at a time: imports serialize on the import lock anyway, and
+    # importing interdependent project modules from several threads can deadlock
+    results = [_probe_import(module_name, class_name) for module_name, class_name in modules]
+    
+    for (module_name, class_name), (error_type, e) in zip(modules, results):
+        if error_type is None:
             print(f"✓ {module_name}.{class_name}")
             passed += 1
-        except ImportError as e:
+        elif error_type == 'ImportError':
             print(f"✗ {module_name}.{class_name} - Import Error: {e}")
             failed += 1
-        except AttributeError as e:
+        elif error_type == 'AttributeError':
             print(f"✗ {module_name}.{class_name} - Attribute Error: {e}")
             failed += 1
-        except Exception as e:
+        else:
             print(f"⚠ {module_name}.{class_name} - Warning: {e}")
             passed += 1  # Still count as passed if module can be imported
     
@@ -128,6 +192,9 @@ def test_config():
     try:
         from config import Config
         
+        # Snapshot the settings once and read them as plain dict lookups
+        cfg = Config.as_dict()
+        
         # Check required config values
         required = [
             'SUPABASE_PROJECT_ID',
@@ -140,7 +207,7 @@ def test_config():
         
         missing = []
         for key in required:
-            value = getattr(Config, key, None)
+            value = cfg.get(key)
             if value:
                 print(f"✓ {key} is set")
             else:
@@ -150,7 +217,7 @@ def test_config():
         # Check optional config
         optional = ['SUPABASE_URL', 'SUPABASE_KEY']
         for key in optional:
-            value = getattr(Config, key, None)
+            value = cfg.get(key)
             if value:
                 print(f"✓ {key} is set (optional)")
             else:
@@ -194,14 +261,21 @@ def test_dependencies():
     installed = 0
     missing = 0
     
-    for package, pip_name in dependencies:
-        try:
-            __import__(package)
+    # Probe each package in its own interpreter; the threads only wait on
+    # the child processes, then results are reported in declaration order
+    with ThreadPoolExecutor(max_workers=min(len(dependencies), MAX_PROBE_PROCESSES)) as executor:
+        results = list(executor.map(_probe_package, [package for package, _ in dependencies]))
+    
+    for (package, pip_name), (error_type, e) in zip(dependencies, results):
+        if error_type is None:
             print(f"✓ {pip_name}")
             installed += 1
-        except ImportError:
+        elif error_type == 'ImportError':
             print(f"✗ {pip_name} - NOT INSTALLED")
             missing += 1
+        else:
+            print(f"⚠ {pip_name} - Installed but failed to load: {e}")
+            installed += 1
     
     print(f"\n{installed}/{len(dependencies)} dependencies installed")
     
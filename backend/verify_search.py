@@ -1,94 +1,123 @@
 #!/usr/bin/env python3
 """
-Quick verification: search for "red dress"
+Quick verification: search for "red dress" (or queries given on the command line)
 """
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from embedding_service import get_embedding_service, normalize_embedding_dimension, TARGET_EMBEDDING_DIM
-from storage_pinecone import PineconeStorage
+from embedding_client import embed_texts
+from storage_pinecone import get_pinecone_storage
 from storage_db import get_db_storage
 
-def main():
+DEFAULT_QUERIES = ["red dress"]
+
+# Matches requested per query; the only search-time knob Pinecone serverless
+# exposes (raise it for recall-sensitive evaluation, lower it for smoke tests)
+TOP_K = int(os.getenv("VERIFY_SEARCH_TOP_K", 20))
+
+
+def main(queries=None):
+    """
+    Run several searches with one embedding batch and one filtered
+    Pinecone fan-out
+    
+    Args:
+        queries: Text queries to search for (defaults to DEFAULT_QUERIES)
+        
+    Returns:
+        True if every query was embedded and searched
+    """
     user_id = "b0539bc2-e877-41ce-8231-c867a0b17503"
-    query = "red dress"
+    queries = queries or DEFAULT_QUERIES
     
     print("=" * 80)
-    print(f"🔍 Testing search: '{query}'")
+    print(f"🔍 Testing search: {', '.join(repr(q) for q in queries)}")
     print("=" * 80)
     
-    # 1. Generate query embedding
-    print("\n1️⃣  Generating query embedding...")
-    embedding_service = get_embedding_service()
-    query_embedding = embedding_service.generate_text_embedding(query)
-    query_embedding = normalize_embedding_dimension(query_embedding, TARGET_EMBEDDING_DIM)
-    print(f"   ✅ Query embedding: {len(query_embedding)} dimensions")
-    
-    # 2. Search Pinecone
-    print("\n2️⃣  Searching Pinecone...")
-    pinecone_storage = PineconeStorage()
+    # 1. Generate query embeddings in a single model call
+    print("\n1️⃣  Generating query embeddings...")
+    embeddings = embed_texts(queries, normalize=True)
     
-    search_results = pinecone_storage.query(
-        query_vector=query_embedding.tolist(),
-        top_k=20,
-        include_metadata=True
-    )
+    searchable = []
+    for query, query_embedding in zip(queries, embeddings):
+        if query_embedding is None:
+            print(f"   ❌ Failed to embed '{query}'")
+            continue
+        searchable.append((query, query_embedding))
     
-    matches = search_results.get('matches', [])
-    print(f"   ✅ Found {len(matches)} total matches")
+    if not searchable:
+        return False
+    print(f"   ✅ {len(searchable)} query embeddings: {len(searchable[0][1])} dimensions")
     
-    # 3. Filter by user
-    print("\n3️⃣  Filtering by user...")
-    db_storage = get_db_storage()
+    # 2. Search Pinecone, restricted to the user's vectors inside the index
+    print(f"\n2️⃣  Searching Pinecone (user filter, top_k={TOP_K})...")
+    pinecone_storage = get_pinecone_storage()
     
-    if db_storage.collection is None:
-        print("   ❌ MongoDB not connected")
-        return
+    matches_per_query = pinecone_storage.query_batch(
+        query_vectors=[query_embedding.tolist() for _, query_embedding in searchable],
+        top_k=TOP_K,
+        filter={'user_id': {'$eq': user_id}}
+    )
     
-    # Extract file IDs
-    file_ids = []
-    score_map = {}
-    for match in matches:
-        file_id = match.get('id', '')
-        if '_chunk_' in file_id:
-            file_id = file_id.split('_chunk_')[0]
-        
-        score = match.get('score', 0)
-        if file_id not in score_map or score > score_map[file_id]:
-            score_map[file_id] = score
-            if file_id not in file_ids:
-                file_ids.append(file_id)
+    # Best match per file for each query (chunks collapse onto their file)
+    best_per_query = []
+    for (query, _), matches in zip(searchable, matches_per_query):
+        print(f"   ✅ '{query}': {len(matches)} matches for user")
+        best = {}
+        for match in matches:
+            file_id = match['file_id'].partition('_chunk_')[0]
+            current = best.get(file_id)
+            if current is None or match['score'] > current['score']:
+                best[file_id] = match
+        best_per_query.append(best)
     
-    # Fetch from MongoDB
-    mongo_query = {
-        'file_id': {'$in': file_ids},
-        'user_id': user_id,
+    # 3. Fill in display names missing from vector metadata (one lookup)
+    missing_names = {
+        file_id
+        for best in best_per_query
+        for file_id, match in best.items()
+        if not match['metadata'].get('original_name')
     }
-    
-    user_files = list(db_storage.collection.find(mongo_query))
-    print(f"   ✅ Found {len(user_files)} files for user")
+    names = {}
+    if missing_names:
+        print("\n3️⃣  Looking up missing file names...")
+        db_storage = get_db_storage()
+        
+        if db_storage.collection is None:
+            print("   ⚠️  MongoDB not connected, names will show as unknown")
+        else:
+            # Only the name is displayed, so skip the rest of each document
+            cursor = db_storage.collection.find(
+                {'file_id': {'$in': list(missing_names)}, 'user_id': user_id},
+                projection={'_id': 0, 'file_id': 1, 'metadata.file_name': 1}
+            )
+            names = {doc.get('file_id'): doc.get('metadata', {}).get('file_name', 'unknown') for doc in cursor}
+            print(f"   ✅ Found {len(names)} of {len(missing_names)} names")
     
     # 4. Show results
     print("\n4️⃣  Search results:")
-    print("   " + "-" * 76)
-    print(f"   {'Score':<10} {'Type':<10} {'File Name'}")
-    print("   " + "-" * 76)
-    
-    for file_doc in user_files:
-        file_id = file_doc.get('file_id')
-        file_name = file_doc.get('metadata', {}).get('file_name', 'unknown')
-        file_type = file_doc.get('metadata', {}).get('type', 'unknown')
-        score = score_map.get(file_id, 0)
+    for (query, _), best in zip(searchable, best_per_query):
+        print(f"\n   Query: '{query}'")
+        print("   " + "-" * 76)
+        print(f"   {'Score':<10} {'Type':<10} {'File Name'}")
+        print("   " + "-" * 76)
+        
+        for file_id, match in best.items():
+            metadata = match['metadata']
+            file_name = metadata.get('original_name') or names.get(file_id, 'unknown')
+            file_type = metadata.get('type', 'unknown')
+            
+            print(f"   {match['score']:<10.4f} {file_type:<10} {file_name}")
         
-        print(f"   {score:<10.4f} {file_type:<10} {file_name}")
+        print(f"   ✅ {len(best)} results for '{query}'")
     
     print("\n" + "=" * 80)
-    print(f"✅ Search returned {len(user_files)} results for '{query}'")
+    print(f"✅ Search complete for {len(searchable)} queries")
     print("=" * 80)
+    return len(searchable) == len(queries)
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(0 if main(sys.argv[1:]) else 1)
@@ -2,66 +2,110 @@
 """
 Verify all storage backends
 """
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 from storage_s3 import S3Storage
 from storage_db import get_db_storage
-from storage_pinecone import PineconeStorage
+from storage_pinecone import get_pinecone_storage
+
+def probe_s3():
+    """Check Supabase S3 storage; returns (ok, report lines)"""
+    lines = []
+    try:
+        s3 = S3Storage()
+        result = s3.list_files()
+        if result.get('success'):
+            lines.append(f"✓ Connected to S3")
+            lines.append(f"✓ Files stored: {result['count']}")
+            for file in result['files'][:5]:  # Show first 5
+                lines.append(f"  - {file['key']} ({file['size']} bytes)")
+        else:
+            lines.append(f"❌ Error: {result.get('error')}")
+            return False, lines
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+        return False, lines
+    return True, lines
+
+def probe_mongo():
+    """Check MongoDB; returns (ok, report lines)"""
+    lines = []
+    try:
+        db = get_db_storage()
+        if getattr(db, 'collection', None) is None:
+            lines.append("❌ Error: MongoDB not connected")
+            return False, lines
+        media_list = db.get_all_media(limit=10)
+        lines.append(f"✓ Connected to MongoDB")
+        lines.append(f"✓ Media records: {len(media_list)}")
+        for media in media_list:
+            lines.append(f"  - {media['file_id']}")
+            lines.append(f"    Type: {media['metadata'].get('type')}")
+            lines.append(f"    Format: {media['metadata'].get('format')}")
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+        return False, lines
+    return True, lines
+
+def probe_pinecone():
+    """Check the Pinecone index; returns (ok, report lines)"""
+    lines = []
+    try:
+        pinecone = get_pinecone_storage()
+        stats = pinecone.get_index_stats()
+        if stats.get('success'):
+            lines.append(f"✓ Connected to Pinecone")
+            lines.append(f"✓ Index stats:")
+            index_stats = stats['stats']
+            if 'total_vector_count' in index_stats:
+                lines.append(f"  - Total vectors: {index_stats['total_vector_count']}")
+            if 'dimension' in index_stats:
+                lines.append(f"  - Dimension: {index_stats['dimension']}")
+            lines.append(f"  - Full stats: {index_stats}")
+        else:
+            lines.append(f"❌ Error: {stats.get('error')}")
+            return False, lines
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+        return False, lines
+    return True, lines
+
+# (section title, probe) in report order
+PROBES = [
+    ("1. SUPABASE S3 STORAGE", probe_s3),
+    ("2. MONGODB", probe_mongo),
+    ("3. PINECONE VECTOR DATABASE", probe_pinecone),
+]
 
-print("=" * 60)
-print("STORAGE VERIFICATION")
-print("=" * 60)
+def main():
+    """
+    Check S3, MongoDB and Pinecone connectivity
+    
+    Returns:
+        True if every backend is reachable
+    """
+    print("=" * 60)
+    print("STORAGE VERIFICATION")
+    print("=" * 60)
 
-# 1. Supabase S3
-print("\n1. SUPABASE S3 STORAGE")
-print("-" * 60)
-try:
-    s3 = S3Storage()
-    result = s3.list_files()
-    if result.get('success'):
-        print(f"✓ Connected to S3")
-        print(f"✓ Files stored: {result['count']}")
-        for file in result['files'][:5]:  # Show first 5
-            print(f"  - {file['key']} ({file['size']} bytes)")
-    else:
-        print(f"❌ Error: {result.get('error')}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+    # The backends are independent, so probe them all at once
+    with ThreadPoolExecutor(max_workers=len(PROBES)) as executor:
+        reports = list(executor.map(lambda probe: probe[1](), PROBES))
 
-# 2. MongoDB
-print("\n2. MONGODB")
-print("-" * 60)
-try:
-    db = get_db_storage()
-    media_list = db.get_all_media(limit=10)
-    print(f"✓ Connected to MongoDB")
-    print(f"✓ Media records: {len(media_list)}")
-    for media in media_list:
-        print(f"  - {media['file_id']}")
-        print(f"    Type: {media['metadata'].get('type')}")
-        print(f"    Format: {media['metadata'].get('format')}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+    for (title, _), (_, lines) in zip(PROBES, reports):
+        print(f"\n{title}")
+        print("-" * 60)
+        for line in lines:
+            print(line)
 
-# 3. Pinecone
-print("\n3. PINECONE VECTOR DATABASE")
-print("-" * 60)
-try:
-    pinecone = PineconeStorage()
-    stats = pinecone.get_index_stats()
-    if stats.get('success'):
-        print(f"✓ Connected to Pinecone")
-        print(f"✓ Index stats:")
-        index_stats = stats['stats']
-        if 'total_vector_count' in index_stats:
-            print(f"  - Total vectors: {index_stats['total_vector_count']}")
-        if 'dimension' in index_stats:
-            print(f"  - Dimension: {index_stats['dimension']}")
-        print(f"  - Full stats: {index_stats}")
-    else:
-        print(f"❌ Error: {stats.get('error')}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+    ok = all(probe_ok for probe_ok, _ in reports)
+    
+    print("\n" + "=" * 60)
+    print("✓ Storage verification complete!" if ok else "❌ Storage verification failed")
+    print("=" * 60)
+    return ok
 
-print("\n" + "=" * 60)
-print("✓ Storage verification complete!")
-print("=" * 60)
 
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)